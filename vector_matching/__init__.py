@@ -0,0 +1,7 @@
+# Celery is optioneel; zonder Celery draaien achtergrondtaken in het web proces
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ('celery_app',)
@@ -0,0 +1,20 @@
+"""
+Celery configuratie voor vector_matching project.
+
+Start een worker met:
+    celery -A vector_matching worker -Q embedding,celery --loglevel=info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vector_matching.settings')
+
+app = Celery('vector_matching')
+
+# Alle CELERY_* instellingen uit settings.py overnemen
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Zoek tasks.py modules in alle geïnstalleerde apps
+app.autodiscover_tasks()
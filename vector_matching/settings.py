@@ -89,8 +89,15 @@ WSGI_APPLICATION = 'vector_matching.wsgi.application'
 # Database configuratie - SQLite voor lokale ontwikkeling
 if os.environ.get('DATABASE_URL'):
     # Productie: PostgreSQL via DATABASE_URL
+    # Verbindingen hergebruiken tussen requests in plaats van per request een nieuwe (TLS) verbinding
+    # op te zetten; de health check vervangt een verbroken verbinding voordat een request hem gebruikt.
+    # Zet DATABASE_CONN_MAX_AGE op 0 achter een pgbouncer in transaction pooling mode.
     DATABASES = {
-        'default': dj_database_url.parse(os.environ.get('DATABASE_URL'))
+        'default': dj_database_url.parse(
+            os.environ.get('DATABASE_URL'),
+            conn_max_age=int(os.environ.get('DATABASE_CONN_MAX_AGE', '600')),
+            conn_health_checks=True,
+        )
     }
 else:
     # Lokale ontwikkeling: SQLite
@@ -102,6 +109,25 @@ else:
     }
 
 
+# Cache
+# Met CACHE_URL (bijv. redis://...) delen web en worker processen één cache, nodig voor
+# locks en resultaten van achtergrondtaken; zonder CACHE_URL een cache in het lokale geheugen, alleen
+# geschikt voor één web proces zonder Celery worker (zie system check vector_matching_app.W001)
+if os.environ.get('CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -136,6 +162,9 @@ USE_TZ = True
 LOGIN_URL = 'vector_matching_app:login'
 LOGIN_REDIRECT_URL = 'vector_matching_app:index'
 LOGOUT_REDIRECT_URL = 'vector_matching_app:login'
+# Aantal reverse proxies vóór de app dat een adres aan X-Forwarded-For toevoegt (Render: 1).
+# Het client IP is het zoveelste adres van rechts; bij 0 of te weinig adressen telt REMOTE_ADDR
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', '1'))
 
 
 # Static files (CSS, JavaScript, Images)
@@ -162,6 +191,10 @@ if not DEBUG:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads direct naar een tijdelijk bestand streamen in plaats van in het geheugen te bufferen,
+# zodat een upload van veel CV's het geheugen niet laat pieken; de storage verplaatst het bestand daarna
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -169,6 +202,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # OpenAI API Key
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+# Maximaal aantal OpenAI calls per seconde over alle workers samen (0 = geen limiet)
+OPENAI_REQUESTS_PER_SECOND = int(os.environ.get('OPENAI_REQUESTS_PER_SECOND', '3'))
+
+# Achtergrondtaken (Celery)
+# Zonder CELERY_BROKER_URL draaien taken in een thread pool binnen het web proces
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
+CELERY_TASK_ROUTES = {
+    # Zware PDF/OpenAI verwerking op een eigen queue zodat andere taken niet wachten
+    'vector_matching_app.tasks.process_candidate_pipeline': {'queue': 'embedding'},
+    'vector_matching_app.tasks.process_candidate_batch': {'queue': 'embedding'},
+    'vector_matching_app.tasks.reprocess_candidate': {'queue': 'embedding'},
+    'vector_matching_app.tasks.batch_reprocess_candidates': {'queue': 'embedding'},
+    'vector_matching_app.tasks.reprocess_vacature_embedding': {'queue': 'embedding'},
+}
+BACKGROUND_TASK_WORKERS = int(os.environ.get('BACKGROUND_TASK_WORKERS', '2'))
 
 
 # Logging configuration
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VectorMatchingAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vector_matching_app'
+
+    def ready(self):
+        from . import checks  # noqa: F401 - registreert de system checks
@@ -0,0 +1,30 @@
+"""
+System checks voor de configuratie van achtergrondtaken.
+"""
+import os
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    De vacature update bewaart zijn lock en status in de cache; meerdere processen moeten die delen.
+
+    Een cache in het lokale geheugen is per proces. Met een Celery worker of meerdere gunicorn
+    workers (WEB_CONCURRENCY) ziet de status polling dan niet wat de update doet.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if not backend.endswith('LocMemCache'):
+        return []
+
+    if settings.CELERY_BROKER_URL or int(os.environ.get('WEB_CONCURRENCY', '1')) > 1:
+        return [
+            Warning(
+                'De cache is niet gedeeld tussen processen, terwijl er meerdere processen draaien.',
+                hint='Zet CACHE_URL (bijv. redis://...) zodat de vacature update status en locks gedeeld worden.',
+                id='vector_matching_app.W001',
+            )
+        ]
+    return []
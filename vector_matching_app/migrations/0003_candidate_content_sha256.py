@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0002_fix_embedding_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='content_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:27
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def mark_existing_duplicates(apps, schema_editor):
+    """Zet kandidaten die eerder als 'failed' + 'Duplicaat: ...' zijn gemarkeerd om naar de nieuwe status."""
+    Candidate = apps.get_model('vector_matching_app', 'Candidate')
+    for candidate in Candidate.objects.filter(embed_status='failed', error_message__startswith='Duplicaat'):
+        match = re.search(r'bij kandidaat (\d+)', candidate.error_message)
+        candidate.embed_status = 'duplicate'
+        if match and Candidate.objects.filter(id=int(match.group(1))).exists():
+            candidate.duplicate_of_id = int(match.group(1))
+        candidate.save(update_fields=['embed_status', 'duplicate_of'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0003_candidate_content_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='vector_matching_app.candidate'),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='embed_status',
+            field=models.CharField(choices=[('queued', 'In wachtrij'), ('processing', 'Wordt verwerkt'), ('completed', 'Voltooid'), ('failed', 'Mislukt'), ('duplicate', 'Duplicaat')], default='queued', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_duplicates, migrations.RunPython.noop),
+    ]
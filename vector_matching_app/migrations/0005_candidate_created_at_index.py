@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0004_candidate_duplicate_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['-created_at', '-id'], name='vector_matc_created_9e4360_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0005_candidate_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['embed_status', 'updated_at'], name='vector_matc_embed_s_5ec6e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['-updated_at'], name='vector_matc_updated_906a18_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:42
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_cv_texts(apps, schema_editor):
+    """Vul de hash van de genormaliseerde CV tekst voor bestaande kandidaten."""
+    Candidate = apps.get_model('vector_matching_app', 'Candidate')
+    candidates = []
+    for candidate in Candidate.objects.exclude(cv_text='').only('id', 'cv_text').iterator():
+        candidate.cv_text_sha256 = hashlib.sha256(' '.join(candidate.cv_text.lower().split()).encode('utf-8')).hexdigest()
+        candidates.append(candidate)
+    Candidate.objects.bulk_update(candidates, ['cv_text_sha256'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0006_candidate_status_updated_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='cv_text_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.RunPython(hash_existing_cv_texts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-16 12:55
+
+from django.db import migrations
+
+
+# Standaard prompts per type: (naam, inhoud)
+DEFAULT_PROMPTS = {
+    'profile_summary': ('Kandidaten Samenvatting', """Schrijf één zakelijke Nederlandse alinea (80–140 woorden) die de kandidaat samenvat voor matching. Benoem opleiding, jaren ervaring, functietitels, domeinen, vaardigheden, talen, beschikbaarheid. Gebruik alleen info uit de CV.
+
+CV tekst:
+"""),
+    'vacature_summary': ('Vacature Samenvatting', """Schrijf één zakelijke Nederlandse alinea (80–140 woorden) die de vacature samenvat voor matching met kandidaten. Focus vooral op:
+
+1. Functietitel en niveau
+2. Belangrijkste eisen en kwalificaties
+3. Verantwoordelijkheden en taken
+4. Gewenste ervaring en opleiding
+5. Vaardigheden en competenties
+6. Locatie en arbeidsvoorwaarden (indien relevant)
+
+Gebruik alleen informatie uit de vacaturetekst. Maak het geschikt voor matching met kandidatenprofielen.
+
+Vacature tekst:
+"""),
+    'cv_parsing': ('CV Parsing', """Je bent een NL data-extractie-assistent. Antwoord uitsluitend met JSON met deze sleutels:
+{ "volledige_naam": "...", "email": "...", "telefoonnummer": "...", "straat": "...", "huisnummer": "...", "postcode": "...", "woonplaats": "...", "opleidingsniveau": "...", "functietitels": ["..."], "jaren_ervaring": 0 }
+
+BELANGRIJK voor opleidingsniveau: Gebruik ALTIJD één van deze categorieën:
+- VMBO (voor VMBO, LBO, VBO)
+- HAVO (voor HAVO, 5-jarig HAVO)
+- VWO (voor VWO, Atheneum, Gymnasium)
+- MBO (voor MBO, ROC, niveau 2/3/4)
+- HBO (voor HBO, Hogeschool, Bachelor)
+- WO (voor WO, Universiteit, Master, PhD)
+- Overige (voor alle andere opleidingen)
+
+CV tekst:
+"""),
+}
+
+
+def seed_default_prompts(apps, schema_editor):
+    """Maak de standaard prompts aan voor de types die nog geen prompt hebben."""
+    Prompt = apps.get_model('vector_matching_app', 'Prompt')
+    existing_types = set(
+        Prompt.objects.filter(prompt_type__in=DEFAULT_PROMPTS.keys()).values_list('prompt_type', flat=True)
+    )
+    Prompt.objects.bulk_create([
+        Prompt(name=name, prompt_type=prompt_type, content=content, is_active=True)
+        for prompt_type, (name, content) in DEFAULT_PROMPTS.items()
+        if prompt_type not in existing_types
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0007_candidate_cv_text_sha256'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_default_prompts, migrations.RunPython.noop),
+    ]
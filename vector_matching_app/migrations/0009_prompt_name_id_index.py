@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vector_matching_app', '0008_seed_default_prompts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prompt',
+            index=models.Index(fields=['name', '-id'], name='vector_matc_name_02308e_idx'),
+        ),
+    ]
@@ -27,6 +27,7 @@ class Candidate(models.Model):
         ('processing', 'Wordt verwerkt'),
         ('completed', 'Voltooid'),
         ('failed', 'Mislukt'),
+        ('duplicate', 'Duplicaat'),
     ]
     
     # Basis informatie
@@ -47,7 +48,9 @@ class Candidate(models.Model):
     
     # CV bestanden en verwerking
     cv_pdf = models.FileField(upload_to='cvs/', blank=True, null=True)
+    content_sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # Hash van het PDF bestand
     cv_text = models.TextField(blank=True)  # Geëxtraheerde tekst uit PDF
+    cv_text_sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # Hash van de genormaliseerde CV tekst
     extract_json = models.JSONField(default=dict, blank=True)  # Gestructureerde data uit CV
     profile_text = models.TextField(blank=True)  # Samenvatting voor matching
     
@@ -64,6 +67,9 @@ class Candidate(models.Model):
     )
     processing_step = models.CharField(max_length=50, blank=True)  # Huidige stap in pipeline
     error_message = models.TextField(blank=True)  # Foutmelding bij falen
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates'
+    )  # Bestaande kandidaat waarvan dit een duplicaat is
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -71,6 +77,11 @@ class Candidate(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),  # Keyset paginatie kandidatenlijst
+            models.Index(fields=['embed_status', 'updated_at']),  # Filteren op status (matching, admin)
+            models.Index(fields=['-updated_at']),  # Recente kandidaten op het dashboard
+        ]
     
     def __str__(self):
         return self.name or f"Kandidaat {self.id}"
@@ -83,6 +94,7 @@ class Candidate(models.Model):
             'queued': 'badge-warning',
             'processing': 'badge-info',
             'failed': 'badge-error',
+            'duplicate': 'badge-neutral',
         }
         return status_classes.get(self.embed_status, 'badge-neutral')
     
@@ -94,6 +106,7 @@ class Candidate(models.Model):
             'queued': '⏳',
             'processing': '🔄',
             'failed': '❌',
+            'duplicate': '⧉',
         }
         return status_icons.get(self.embed_status, '❓')
     
@@ -178,6 +191,9 @@ class Prompt(models.Model):
     class Meta:
         ordering = ['-version', '-created_at']
         unique_together = ['name', 'version']
+        indexes = [
+            models.Index(fields=['name', '-id']),  # Nieuwste versie per prompt naam (prompt overzicht)
+        ]
     
     def __str__(self):
         return f"{self.name} v{self.version}"
@@ -0,0 +1,100 @@
+"""
+Achtergrondtaken buiten de request/response cyclus.
+
+Als Celery geïnstalleerd is en CELERY_BROKER_URL is ingesteld worden taken naar de
+Celery workers gestuurd. Zonder broker draaien ze in een kleine thread pool binnen
+het web proces, zodat de applicatie ook zonder aparte worker blijft werken.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+try:
+    from celery import group, shared_task
+except ImportError:
+    group = None
+    shared_task = None
+
+logger = logging.getLogger(__name__)
+
+
+def celery_enabled() -> bool:
+    """Geeft terug of taken via Celery worden uitgevoerd."""
+    return shared_task is not None and bool(getattr(settings, 'CELERY_BROKER_URL', None))
+
+
+# Singleton thread pool voor de fallback zonder Celery
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Haalt de singleton thread pool op."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+            thread_name_prefix='achtergrondtaak',
+        )
+    return _executor
+
+
+def _run_in_thread(func, args, kwargs):
+    """Voer een taak uit in de thread pool en ruim de database connectie op."""
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        # Taken zetten zelf hun foutstatus; hier alleen loggen zodat de fout niet verdwijnt
+        logger.error(f"Achtergrondtaak {func.__name__} gefaald: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def background_task(**options):
+    """
+    Decorator die een functie als achtergrondtaak registreert.
+
+    De functie blijft direct (synchroon) aanroepbaar en krijgt een .delay() methode.
+    Met Celery wordt het een shared_task en worden options (bijv. rate_limit) doorgegeven;
+    zonder Celery voert .delay() de functie uit in de thread pool.
+
+    Args:
+        **options: Celery task opties, genegeerd zonder Celery
+    """
+    def decorator(func):
+        if celery_enabled():
+            return shared_task(**options)(func)
+
+        def delay(*args, **kwargs):
+            return _get_executor().submit(_run_in_thread, func, args, kwargs)
+
+        func.delay = delay
+        return func
+
+    return decorator
+
+
+def fan_out(task, args_list):
+    """
+    Start een achtergrondtaak voor elke set argumenten.
+
+    Met Celery gaat dit als één group naar de broker, zodat de workers de taken
+    parallel oppakken; zonder Celery wordt elke taak in de thread pool gezet.
+
+    Args:
+        task: functie gedecoreerd met background_task
+        args_list: iterable van argument tuples
+
+    Returns:
+        int: aantal gestarte taken
+    """
+    args_list = [tuple(args) for args in args_list]
+    if not args_list:
+        return 0
+    if celery_enabled():
+        group(task.s(*args) for args in args_list).apply_async()
+    else:
+        for args in args_list:
+            task.delay(*args)
+    return len(args_list)
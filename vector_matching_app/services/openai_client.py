@@ -2,11 +2,41 @@
 OpenAI client service voor embeddings en chat functionaliteit.
 """
 import openai
+import time
 from django.conf import settings
+from django.core.cache import cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cache sleutel prefix voor de teller van OpenAI calls per seconde
+RATE_LIMIT_CACHE_KEY = 'openai_rate_limit'
+
+
+def wait_for_rate_limit():
+    """
+    Wacht tot er binnen de limiet OPENAI_REQUESTS_PER_SECOND een OpenAI call gedaan mag worden.
+    
+    De teller staat in de cache, zodat de limiet ook over meerdere workers geldt.
+    Er wordt alleen gewacht als de limiet daadwerkelijk bereikt is.
+    """
+    limit = settings.OPENAI_REQUESTS_PER_SECOND
+    if not limit:
+        return
+    
+    while True:
+        now = time.time()
+        key = f"{RATE_LIMIT_CACHE_KEY}:{int(now)}"
+        cache.add(key, 0, 2)
+        try:
+            if cache.incr(key) <= limit:
+                return
+        except ValueError:
+            # Sleutel is net verlopen, opnieuw proberen in de volgende seconde
+            pass
+        # Limiet bereikt: wacht tot de volgende seconde
+        time.sleep(1 - (now % 1))
+
 
 class OpenAIClient:
     """OpenAI client voor embeddings en chat."""
@@ -33,6 +63,7 @@ class OpenAIClient:
             Exception: Als de API call faalt
         """
         try:
+            wait_for_rate_limit()
             response = self.client.embeddings.create(
                 input=text,
                 model=model
@@ -42,6 +73,31 @@ class OpenAIClient:
             logger.error(f"Fout bij het ophalen van embedding: {e}")
             raise
     
+    def embed_batch(self, texts: list[str], model: str = "text-embedding-3-small") -> list[list[float]]:
+        """
+        Haalt embeddings op voor meerdere teksten in één API call.
+        
+        Args:
+            texts: De teksten om te embedden (maximaal 2048 per call)
+            model: Het embedding model om te gebruiken
+            
+        Returns:
+            List van embeddings, in dezelfde volgorde als texts
+            
+        Raises:
+            Exception: Als de API call faalt
+        """
+        try:
+            wait_for_rate_limit()
+            response = self.client.embeddings.create(
+                input=texts,
+                model=model
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            logger.error(f"Fout bij het ophalen van batch embeddings: {e}")
+            raise
+    
     def chat(self, messages: list[dict], model: str = "gpt-3.5-turbo") -> str:
         """
         Chat functionaliteit met OpenAI.
@@ -57,6 +113,7 @@ class OpenAIClient:
             Exception: Als de API call faalt
         """
         try:
+            wait_for_rate_limit()
             response = self.client.chat.completions.create(
                 model=model,
                 messages=messages,
@@ -0,0 +1,232 @@
+"""
+Synchronisatie van vacatures met de externe XML feed.
+"""
+import logging
+import xml.etree.ElementTree as ET
+from operator import methodcaller
+
+import requests
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import Vacature
+
+# lxml parseert de XML feed veel sneller; zonder lxml valt dit terug op de standaard bibliotheek
+try:
+    from lxml import etree as feed_etree
+    LXML_AVAILABLE = True
+except ImportError:
+    feed_etree = ET
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FEED_URL = "https://noordtalent.nl/werkzoeken-feed.xml"
+
+# Gedeelde sessie, zodat opeenvolgende updates de keep-alive verbinding (TCP + TLS) hergebruiken
+_feed_session = requests.Session()
+
+# Parse fouten van zowel lxml als de standaard bibliotheek
+FEED_PARSE_ERRORS = (ET.ParseError, feed_etree.ParseError)
+
+# Aantal vacatures per bulk upsert bij het verwerken van de XML feed
+VACATURE_BATCH_SIZE = 500
+
+# Vacature veld en bijbehorende tag die per <vacature> uit de feed gelezen worden
+_FEED_FIELDS = (
+    ('externe_id', 'id'),
+    ('titel', 'title'),
+    ('url', 'url'),
+    ('organisatie', 'company'),
+    ('plaats', 'city'),
+    ('postcode', 'zipcode'),
+    ('beschrijving', 'description'),
+)
+# Eén keer aangemaakte findtext aanroepen per veld, met '' als standaardwaarde
+_FEED_GETTERS = tuple((attr, methodcaller('findtext', tag, '')) for attr, tag in _FEED_FIELDS)
+
+# Cache sleutel voor de ETag/Last-Modified van de laatst verwerkte XML feed
+FEED_VALIDATORS_CACHE_KEY = 'vacature_feed_validators'
+
+# Cache sleutels voor de achtergrond update: lock tegen dubbele updates en het laatste resultaat
+FEED_SYNC_LOCK_CACHE_KEY = 'vacature_feed_sync_lock'
+FEED_SYNC_LOCK_TTL = 300
+FEED_SYNC_RESULT_CACHE_KEY = 'vacature_feed_sync_result'
+
+
+def _iter_feed_vacatures(stream):
+    """
+    Loop streamend door de <vacature> elementen van de XML feed.
+
+    Verwerkte elementen worden na gebruik vrijgegeven, zodat het geheugengebruik
+    niet groeit met de grootte van de feed.
+    """
+    if LXML_AVAILABLE:
+        # lxml filtert zelf op tag, in C, en laat de overige elementen ongemoeid
+        for event, item in feed_etree.iterparse(stream, events=('end',), tag='vacature'):
+            yield item
+            item.clear()
+            # Ook de lege voorgangers uit de boom verwijderen
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+        return
+
+    for event, item in feed_etree.iterparse(stream, events=('end',)):
+        if item.tag != 'vacature':
+            continue
+        yield item
+        item.clear()
+
+
+def _feed_conditional_headers():
+    """Headers voor een conditionele GET op de XML feed, op basis van de vorige update."""
+    validators = cache.get(FEED_VALIDATORS_CACHE_KEY) or {}
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _store_feed_validators(response):
+    """Bewaar de ETag/Last-Modified van een volledig verwerkte XML feed."""
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    if any(validators.values()):
+        cache.set(FEED_VALIDATORS_CACHE_KEY, validators, None)
+
+
+def _upsert_vacature_batch(batch):
+    """
+    Schrijf een batch vacatures uit de feed weg met één bulk upsert.
+
+    Args:
+        batch: dict van externe_id naar (niet opgeslagen) Vacature
+
+    Returns:
+        tuple: (toegevoegd, bijgewerkt, fouten)
+    """
+    try:
+        bestaande_ids = set(
+            Vacature.objects.filter(externe_id__in=batch.keys()).values_list('externe_id', flat=True)
+        )
+        # Savepoint, zodat een mislukte batch de omliggende transactie niet afbreekt
+        with transaction.atomic():
+            Vacature.objects.bulk_create(
+                batch.values(),
+                update_conflicts=True,
+                unique_fields=['externe_id'],
+                update_fields=['titel', 'organisatie', 'plaats', 'postcode', 'url', 'beschrijving', 'actief', 'updated_at'],
+            )
+    except Exception as e:
+        logger.error(f"Fout bij opslaan van {len(batch)} vacatures: {str(e)}")
+        return 0, 0, len(batch)
+
+    bijgewerkt = len(bestaande_ids)
+    return len(batch) - bijgewerkt, bijgewerkt, 0
+
+
+def sync_vacatures_from_feed() -> dict:
+    """
+    Werk de vacatures bij vanuit de XML feed.
+
+    Nieuwe vacatures worden toegevoegd, bestaande bijgewerkt en vacatures die niet
+    meer in de feed staan gedeactiveerd.
+
+    Returns:
+        dict met toegevoegd, bijgewerkt, gedeactiveerd, totaal_actief, fouten en niet_gewijzigd
+
+    Raises:
+        requests.RequestException: Als de feed niet opgehaald kan worden
+        FEED_PARSE_ERRORS: Als de feed geen geldige XML is
+    """
+    # Verwijder eerst alle demo vacatures (zonder externe_id)
+    demo_vacatures = Vacature.objects.filter(externe_id__isnull=True) | Vacature.objects.filter(externe_id="temp")
+    demo_count = demo_vacatures.count()
+    if demo_count > 0:
+        demo_vacatures.delete()
+        logger.info(f"{demo_count} demo vacatures verwijderd")
+
+    # Teller voor statistieken
+    stats = {
+        'toegevoegd': 0,
+        'bijgewerkt': 0,
+        'gedeactiveerd': 0,
+        'totaal_actief': 0,
+        'fouten': 0,
+        'niet_gewijzigd': False,
+    }
+
+    # Verzamel alle externe IDs uit de feed, met de batch waarin elk ID terechtkomt
+    feed_externe_ids = {}
+    batches = []
+    batch = {}
+
+    # Haal XML feed op en parse deze streamend, buiten de transactie: zo worden er geen
+    # database locks vastgehouden terwijl er op het netwerk gewacht wordt
+    with _feed_session.get(FEED_URL, headers=_feed_conditional_headers(), timeout=30, stream=True) as response:
+        # Feed niet gewijzigd sinds de vorige update: parsen en database writes overslaan
+        if response.status_code == 304:
+            logger.info("XML feed niet gewijzigd sinds de vorige update")
+            stats['niet_gewijzigd'] = True
+            stats['totaal_actief'] = Vacature.objects.filter(actief=True).count()
+            return stats
+
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        for item in _iter_feed_vacatures(response.raw):
+            try:
+                # Haal velden op, met één zoekactie per veld
+                fields = {attr: getter(item) for attr, getter in _FEED_GETTERS}
+                externe_id = fields['externe_id']
+
+                if not externe_id:
+                    continue
+
+                # Een ID dat vaker in de feed staat blijft in zijn eerste batch, met de laatste gegevens,
+                # zodat het ook over batches heen maar één keer geteld wordt
+                feed_externe_ids.setdefault(externe_id, batch)[externe_id] = Vacature(**fields, actief=True)
+            except Exception as e:
+                stats['fouten'] += 1
+                logger.error(f"Fout bij verwerken vacature: {str(e)}")
+
+            if len(batch) >= VACATURE_BATCH_SIZE:
+                batches.append(batch)
+                batch = {}
+
+    if batch:
+        batches.append(batch)
+
+    # Alleen de writes in één transactie, zodat er niet per batch gecommit wordt
+    with transaction.atomic():
+        for batch in batches:
+            toegevoegd, bijgewerkt, fouten = _upsert_vacature_batch(batch)
+            stats['toegevoegd'] += toegevoegd
+            stats['bijgewerkt'] += bijgewerkt
+            stats['fouten'] += fouten
+
+        # Markeer vacatures die niet meer in de feed staan als inactief, in één UPDATE
+        stats['gedeactiveerd'] = Vacature.objects.filter(actief=True).exclude(
+            externe_id__in=feed_externe_ids.keys()
+        ).update(actief=False)
+
+    # Na een foutloze update zijn precies de vacatures uit de feed actief, zonder extra COUNT
+    if stats['fouten']:
+        stats['totaal_actief'] = Vacature.objects.filter(actief=True).count()
+    else:
+        stats['totaal_actief'] = len(feed_externe_ids)
+
+    logger.info(
+        f"XML feed verwerkt: {stats['toegevoegd']} toegevoegd, {stats['bijgewerkt']} bijgewerkt, "
+        f"{stats['gedeactiveerd']} gedeactiveerd, {stats['fouten']} fouten"
+    )
+
+    # Alleen na een foutloze update, zodat een mislukte update de volgende keer opnieuw draait
+    if not stats['fouten']:
+        _store_feed_validators(response)
+
+    return stats
@@ -1,11 +1,21 @@
+import hashlib
 import json
 import logging
 import os
 import requests
+import threading
+import time
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
 from .models import Candidate, Vacature, Prompt
+from .services.background import background_task
 from .services.openai_client import get_openai_client
+from .services.vacature_feed import (
+    FEED_PARSE_ERRORS, FEED_SYNC_LOCK_CACHE_KEY, FEED_SYNC_RESULT_CACHE_KEY, sync_vacatures_from_feed
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +31,20 @@ except ImportError:
         PDF_LIBRARY = None
 
 
+def cv_text_hash(text):
+    """SHA-256 van CV tekst, ongevoelig voor hoofdletters en witruimte."""
+    return hashlib.sha256(' '.join(text.lower().split()).encode('utf-8')).hexdigest()
+
+
+def _stopped_as_duplicate(candidate_id):
+    """Geeft True als een pipeline stap de kandidaat als duplicaat heeft gemarkeerd."""
+    candidate = Candidate.objects.only('embed_status', 'error_message').get(id=candidate_id)
+    if candidate.embed_status == 'duplicate':
+        logger.info(f"Verwerkingspipeline gestopt voor kandidaat {candidate_id}: {candidate.error_message}")
+        return True
+    return False
+
+
 def extract_pdf_text(candidate_id):
     """Extract tekst uit PDF CV."""
     try:
@@ -57,9 +81,26 @@ def extract_pdf_text(candidate_id):
         if not cleaned_text:
             raise ValueError("Geen bruikbare tekst na opschoning")
         
-        # Sla tekst op
+        # Sla tekst op, met een hash van de genormaliseerde tekst voor duplicaatcontrole
         candidate.cv_text = cleaned_text
-        candidate.save(update_fields=['cv_text', 'updated_at'])
+        candidate.cv_text_sha256 = cv_text_hash(cleaned_text)
+        
+        # Zelfde CV tekst al bekend (bijv. een opnieuw geëxporteerde PDF): duplicaat, zonder OpenAI calls
+        existing_candidate = Candidate.objects.filter(
+            cv_text_sha256=candidate.cv_text_sha256
+        ).exclude(id=candidate_id).exclude(embed_status__in=['duplicate', 'failed']).order_by('id').only('id').first()
+        if existing_candidate:
+            duplicate_reason = f"CV tekst bestaat al bij kandidaat {existing_candidate.id}"
+            logger.warning(f"Duplicaat gevonden: {duplicate_reason}. Kandidaat {candidate_id} wordt gemarkeerd als duplicaat.")
+            candidate.embed_status = 'duplicate'
+            candidate.duplicate_of = existing_candidate
+            candidate.error_message = f"Duplicaat: {duplicate_reason}"
+            candidate.save(update_fields=[
+                'cv_text', 'cv_text_sha256', 'embed_status', 'duplicate_of', 'error_message', 'updated_at'
+            ])
+            return candidate_id
+        
+        candidate.save(update_fields=['cv_text', 'cv_text_sha256', 'updated_at'])
         
         logger.info(f"PDF tekst geëxtraheerd voor kandidaat {candidate_id}")
         return candidate_id
@@ -200,9 +241,10 @@ CV tekst:
         
         if existing_candidate:
             logger.warning(f"Duplicaat gevonden: {duplicate_reason}. Kandidaat {candidate_id} wordt gemarkeerd als duplicaat.")
-            candidate.embed_status = 'failed'
+            candidate.embed_status = 'duplicate'
+            candidate.duplicate_of = existing_candidate
             candidate.error_message = f"Duplicaat: {duplicate_reason}"
-            candidate.save(update_fields=['embed_status', 'error_message', 'updated_at'])
+            candidate.save(update_fields=['embed_status', 'duplicate_of', 'error_message', 'updated_at'])
             return candidate_id
         
         # Update candidate velden
@@ -284,6 +326,39 @@ CV tekst:
         raise
 
 
+def _store_candidate_embedding(candidate_id, embedding):
+    """Sla een embedding op voor een kandidaat - detecteer kolom type en gebruik juiste cast."""
+    from django.db import connection
+    
+    # Converteer naar lijst
+    embedding_list = embedding.tolist() if hasattr(embedding, 'tolist') else list(embedding)
+    
+    # Converteer naar JSON string voor PostgreSQL
+    embedding_json = json.dumps(embedding_list)
+    
+    # Probeer eerst JSONB, dan vector
+    with connection.cursor() as cursor:
+        try:
+            # Probeer JSONB met JSON string
+            cursor.execute(
+                "UPDATE vector_matching_app_candidate SET embedding = %s::jsonb WHERE id = %s",
+                [embedding_json, candidate_id]
+            )
+            logger.info(f"Embedding opgeslagen als JSONB voor kandidaat {candidate_id}")
+        except Exception as jsonb_error:
+            logger.warning(f"JSONB cast gefaald voor kandidaat {candidate_id}, probeer vector: {jsonb_error}")
+            try:
+                # Probeer vector als fallback
+                cursor.execute(
+                    "UPDATE vector_matching_app_candidate SET embedding = %s::vector WHERE id = %s",
+                    [embedding_list, candidate_id]
+                )
+                logger.info(f"Embedding opgeslagen als vector voor kandidaat {candidate_id}")
+            except Exception as vector_error:
+                logger.error(f"Beide casts gefaald voor kandidaat {candidate_id}: JSONB={jsonb_error}, Vector={vector_error}")
+                raise vector_error
+
+
 def embed_profile_text(candidate_id):
     """Embed profiel tekst met OpenAI."""
     try:
@@ -301,37 +376,8 @@ def embed_profile_text(candidate_id):
             logger.error(f"OpenAI API error bij embedding voor kandidaat {candidate_id}: {str(e)}")
             raise ValueError(f"OpenAI API fout: {str(e)}")
         
-        # Sla embedding op - detecteer kolom type en gebruik juiste cast
-        from django.db import connection
-        
-        # Converteer naar lijst
-        embedding_list = embedding.tolist() if hasattr(embedding, 'tolist') else list(embedding)
-        
-        # Converteer naar JSON string voor PostgreSQL
-        import json
-        embedding_json = json.dumps(embedding_list)
-        
-        # Probeer eerst JSONB, dan vector
-        with connection.cursor() as cursor:
-            try:
-                # Probeer JSONB met JSON string
-                cursor.execute(
-                    "UPDATE vector_matching_app_candidate SET embedding = %s::jsonb WHERE id = %s",
-                    [embedding_json, candidate_id]
-                )
-                logger.info(f"Embedding opgeslagen als JSONB voor kandidaat {candidate_id}")
-            except Exception as jsonb_error:
-                logger.warning(f"JSONB cast gefaald voor kandidaat {candidate_id}, probeer vector: {jsonb_error}")
-                try:
-                    # Probeer vector als fallback
-                    cursor.execute(
-                        "UPDATE vector_matching_app_candidate SET embedding = %s::vector WHERE id = %s",
-                        [embedding_list, candidate_id]
-                    )
-                    logger.info(f"Embedding opgeslagen als vector voor kandidaat {candidate_id}")
-                except Exception as vector_error:
-                    logger.error(f"Beide casts gefaald voor kandidaat {candidate_id}: JSONB={jsonb_error}, Vector={vector_error}")
-                    raise vector_error
+        # Sla embedding op
+        _store_candidate_embedding(candidate_id, embedding)
         
         # Update alleen de timestamp via Django ORM
         candidate.save(update_fields=['updated_at'])
@@ -346,6 +392,36 @@ def embed_profile_text(candidate_id):
         raise
 
 
+# Nominatim gebruiksbeleid: maximaal één verzoek per seconde
+NOMINATIM_MIN_INTERVAL = 1.0
+NOMINATIM_RATE_LIMIT_CACHE_KEY = 'nominatim_rate_limit'
+_nominatim_lock = threading.Lock()
+_nominatim_last_request = 0.0
+
+
+def _nominatim_get(url, **kwargs):
+    """
+    requests.get naar Nominatim, met maximaal één verzoek per seconde.
+
+    Binnen het proces houdt een lock minstens NOMINATIM_MIN_INTERVAL tussen verzoeken; een
+    seconde slot in de cache voorkomt dat andere workers in dezelfde seconde ook een verzoek doen.
+    """
+    global _nominatim_last_request
+    with _nominatim_lock:
+        while True:
+            now = time.time()
+            wait = _nominatim_last_request + NOMINATIM_MIN_INTERVAL - now
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            if cache.add(f"{NOMINATIM_RATE_LIMIT_CACHE_KEY}:{int(now)}", True, 2):
+                break
+            # Deze seconde is al door een ander proces gebruikt: wacht tot de volgende
+            time.sleep(1 - (now % 1))
+        _nominatim_last_request = time.time()
+    return requests.get(url, **kwargs)
+
+
 def get_postcode_for_city(city_name):
     """Haal de eerste postcode op voor een plaatsnaam."""
     import requests
@@ -361,7 +437,7 @@ def get_postcode_for_city(city_name):
             'addressdetails': 1
         }
         
-        response = requests.get(nominatim_url, params=params, timeout=5)
+        response = _nominatim_get(nominatim_url, params=params, timeout=5)
         if response.status_code == 200:
             data = response.json()
             
@@ -498,7 +574,7 @@ def geocode_candidate(candidate_id):
                         'countrycodes': 'nl'  # Focus op Nederland
                     }
                     
-                    response = requests.get(nominatim_url, params=params, timeout=10)
+                    response = _nominatim_get(nominatim_url, params=params, timeout=10)
                     if response.status_code == 200:
                         data = response.json()
                         if data:
@@ -531,14 +607,21 @@ def geocode_candidate(candidate_id):
         return candidate_id
 
 
+@background_task()
 def process_candidate_pipeline(candidate_id):
     """Start de volledige verwerkingspipeline voor een kandidaat."""
     try:
         logger.info(f"Verwerkingspipeline gestart voor kandidaat {candidate_id}")
         
-        # Voer alle stappen synchroon uit
+        # Voer alle stappen na elkaar uit; stop bij een duplicaat (status en foutmelding zijn al gezet)
         extract_pdf_text(candidate_id)
+        if _stopped_as_duplicate(candidate_id):
+            return False
+        
         parse_cv_to_fields(candidate_id)
+        if _stopped_as_duplicate(candidate_id):
+            return False
+        
         generate_profile_summary_text(candidate_id)
         embed_profile_text(candidate_id)
         geocode_candidate(candidate_id)
@@ -553,6 +636,7 @@ def process_candidate_pipeline(candidate_id):
         raise
 
 
+@background_task(rate_limit='10/s')
 def reprocess_candidate(candidate_id):
     """Herstart alleen de profiel samenvatting en embedding voor een kandidaat."""
     try:
@@ -580,6 +664,176 @@ def reprocess_candidate(candidate_id):
         raise
 
 
+def _embed_candidates_batch(candidate_ids, failed_step):
+    """
+    Genereer de embeddings van meerdere kandidaten in één OpenAI call en sla ze op.
+    
+    Kandidaten waarbij dit mislukt krijgen status 'failed' met failed_step als stap.
+    
+    Returns:
+        list: IDs van de kandidaten waarvan de embedding is opgeslagen
+    """
+    profile_texts = dict(Candidate.objects.filter(id__in=candidate_ids).values_list('id', 'profile_text'))
+    
+    # Zonder profiel tekst valt er niets te embedden; markeer die kandidaten direct als mislukt
+    missing_ids = [candidate_id for candidate_id, profile_text in profile_texts.items() if not profile_text]
+    if missing_ids:
+        logger.error(f"Geen profiel tekst gevonden voor kandidaten {missing_ids}")
+        Candidate.objects.filter(id__in=missing_ids).update(
+            embed_status='failed', processing_step=failed_step, error_message="Geen profiel tekst gevonden"
+        )
+        for candidate_id in missing_ids:
+            del profile_texts[candidate_id]
+    if not profile_texts:
+        return []
+    
+    Candidate.objects.filter(id__in=profile_texts.keys()).update(processing_step='Embedding generatie')
+    try:
+        embeddings = get_openai_client().embed_batch(list(profile_texts.values()), model="text-embedding-3-small")
+    except Exception as e:
+        logger.error(f"OpenAI API error bij batch embedding voor {len(profile_texts)} kandidaten: {str(e)}")
+        Candidate.objects.filter(id__in=profile_texts.keys()).update(
+            embed_status='failed', processing_step=failed_step, error_message=f"OpenAI API fout: {str(e)}"
+        )
+        return []
+    
+    completed_ids = []
+    for candidate_id, embedding in zip(profile_texts.keys(), embeddings):
+        try:
+            _store_candidate_embedding(candidate_id, embedding)
+            completed_ids.append(candidate_id)
+        except Exception as e:
+            Candidate.objects.get(id=candidate_id).update_status('failed', failed_step, str(e))
+    return completed_ids
+
+
+@background_task()
+def process_candidate_batch(candidate_ids):
+    """
+    Verwerkingspipeline voor een batch geüploade kandidaten.
+    
+    PDF extractie, parsing en profiel samenvatting gebeuren per kandidaat, de embeddings
+    in één OpenAI call voor de hele batch. Daarna volgt geocoding per kandidaat.
+    """
+    logger.info(f"Verwerkingspipeline gestart voor {len(candidate_ids)} kandidaten")
+    
+    # Een mislukte stap zet de kandidaat zelf al op 'failed'
+    summarized_ids = []
+    for candidate_id in candidate_ids:
+        try:
+            # Stop bij een duplicaat (status en foutmelding zijn al gezet), vóór de OpenAI calls
+            extract_pdf_text(candidate_id)
+            if _stopped_as_duplicate(candidate_id):
+                continue
+            
+            parse_cv_to_fields(candidate_id)
+            if _stopped_as_duplicate(candidate_id):
+                continue
+            
+            generate_profile_summary_text(candidate_id)
+            summarized_ids.append(candidate_id)
+        except Exception as e:
+            logger.error(f"Fout bij verwerken pipeline voor kandidaat {candidate_id}: {str(e)}")
+    
+    completed_ids = _embed_candidates_batch(summarized_ids, 'Embedding generatie')
+    
+    # Geocoding zet de kandidaat op 'completed', ook als er geen locatie gevonden wordt
+    for candidate_id in completed_ids:
+        geocode_candidate(candidate_id)
+    
+    logger.info(f"Verwerkingspipeline voltooid voor {len(completed_ids)} van {len(candidate_ids)} kandidaten")
+    return len(completed_ids)
+
+
+@background_task()
+def batch_reprocess_candidates(candidate_ids):
+    """
+    Herstart profiel samenvatting en embedding voor meerdere kandidaten.
+    
+    De samenvattingen worden per kandidaat gegenereerd, de embeddings in één
+    OpenAI call voor de hele batch.
+    """
+    Candidate.objects.filter(id__in=candidate_ids).update(
+        embed_status='processing', processing_step='Opnieuw embedden', error_message=''
+    )
+    
+    # Profiel samenvattingen; een mislukte kandidaat wordt door de functie zelf op 'failed' gezet
+    summarized_ids = []
+    for candidate_id in candidate_ids:
+        try:
+            generate_profile_summary_text(candidate_id)
+            summarized_ids.append(candidate_id)
+        except Exception as e:
+            logger.error(f"Fout bij opnieuw embedden voor kandidaat {candidate_id}: {str(e)}")
+    
+    completed_ids = _embed_candidates_batch(summarized_ids, 'Opnieuw embedden mislukt')
+    
+    Candidate.objects.filter(id__in=completed_ids).update(
+        embed_status='completed', processing_step='Opnieuw embedden voltooid', updated_at=timezone.now()
+    )
+    logger.info(f"Opnieuw embedden voltooid voor {len(completed_ids)} van {len(candidate_ids)} kandidaten")
+    return len(completed_ids)
+
+
+@background_task()
+def geocode_candidates(candidate_ids):
+    """
+    Geocode meerdere kandidaten na elkaar.
+    
+    Eén taak voor de hele selectie, zodat de Nominatim fallback niet vanuit parallelle
+    workers aangeroepen wordt.
+    """
+    # Nominatim verzoeken worden in _nominatim_get zelf tot één per seconde beperkt
+    for candidate_id in candidate_ids:
+        geocode_candidate(candidate_id)
+    
+    logger.info(f"Geocoding voltooid voor {len(candidate_ids)} kandidaten")
+    return len(candidate_ids)
+
+
+@background_task()
+def update_vacatures_from_feed():
+    """Werk de vacatures bij vanuit de XML feed en bewaar het resultaat voor de interface."""
+    try:
+        stats = sync_vacatures_from_feed()
+        if stats['niet_gewijzigd']:
+            message = 'Vacatures zijn al up-to-date, de feed is niet gewijzigd.'
+        else:
+            message = (
+                f"Vacatures bijgewerkt! Toegevoegd: {stats['toegevoegd']}, "
+                f"Bijgewerkt: {stats['bijgewerkt']}, Gedeactiveerd: {stats['gedeactiveerd']}"
+            )
+        result = {'status': 'done', 'success': True, 'message': message, **stats}
+    except requests.RequestException as e:
+        logger.error(f"Fout bij ophalen XML feed: {str(e)}")
+        result = {'status': 'failed', 'success': False, 'error': f'Kon XML feed niet ophalen: {str(e)}'}
+    except FEED_PARSE_ERRORS as e:
+        logger.error(f"Fout bij parsen XML: {str(e)}")
+        result = {'status': 'failed', 'success': False, 'error': f'Kon XML niet parsen: {str(e)}'}
+    except Exception as e:
+        logger.error(f"Onverwachte fout bij updaten vacatures: {str(e)}")
+        result = {'status': 'failed', 'success': False, 'error': f'Onverwachte fout: {str(e)}'}
+    finally:
+        cache.delete(FEED_SYNC_LOCK_CACHE_KEY)
+    
+    cache.set(FEED_SYNC_RESULT_CACHE_KEY, result, 60 * 60)
+    return result
+
+
+@background_task()
+def delete_cv_files(file_names):
+    """Verwijder CV bestanden van verwijderde kandidaten uit de storage."""
+    deleted = 0
+    for file_name in file_names:
+        try:
+            default_storage.delete(file_name)
+            deleted += 1
+        except OSError as e:
+            logger.warning(f"CV bestand {file_name} kon niet worden verwijderd: {str(e)}")
+    logger.info(f"{deleted} van {len(file_names)} CV bestanden verwijderd")
+    return deleted
+
+
 # Vacature Processing Functions
 def generate_vacature_summary(vacature_id):
     """Genereer een AI samenvatting voor een vacature."""
@@ -722,6 +976,7 @@ def process_vacature_embedding(vacature_id):
         raise
 
 
+@background_task(rate_limit='2/s')
 def reprocess_vacature_embedding(vacature_id):
     """Herverwerk een vacature: genereer nieuwe samenvatting en embedding."""
     try:
@@ -822,39 +1077,45 @@ def generate_matches():
         
         is_postgresql = 'postgresql' in connection.vendor
         
+        # Alleen id en embedding zijn nodig; cv_text, profile_text e.d. blijven in de database
         if is_postgresql:
             # PostgreSQL met VectorField - gebruik eenvoudigere filters
             candidates = Candidate.objects.filter(
                 embedding__isnull=False,
                 embed_status='completed'
-            )
+            ).only('id', 'embedding')
             
             vacatures = Vacature.objects.filter(
                 embedding__isnull=False,
                 actief=True
-            )
+            ).only('id', 'embedding')
         else:
             # SQLite met JSONField
             candidates = Candidate.objects.filter(
                 embedding__isnull=False,
                 embed_status='completed'
-            ).exclude(embedding__isnull=True)
+            ).exclude(embedding__isnull=True).only('id', 'embedding')
             
             vacatures = Vacature.objects.filter(
                 embedding__isnull=False,
                 actief=True
-            ).exclude(embedding__isnull=True)
+            ).exclude(embedding__isnull=True).only('id', 'embedding')
         
-        logger.info(f"Gevonden {candidates.count()} kandidaten en {vacatures.count()} vacatures met embeddings")
+        # Vacatures worden per kandidaat opnieuw doorlopen, dus één keer in het geheugen laden
+        vacatures = list(vacatures)
+        candidate_count = candidates.count()
         
-        if not candidates.exists() or not vacatures.exists():
+        logger.info(f"Gevonden {candidate_count} kandidaten en {len(vacatures)} vacatures met embeddings")
+        
+        if not candidate_count or not vacatures:
             logger.warning("Geen kandidaten of vacatures met embeddings gevonden")
             return
         
         # Bereken alle combinaties
         matches_data = []
         
-        for candidate in candidates:
+        # Kandidaten in blokken streamen in plaats van de hele tabel te materialiseren
+        for candidate in candidates.iterator(chunk_size=1000):
             # Check of embedding bestaat en niet leeg is
             if not candidate.embedding:
                 continue
@@ -949,14 +1210,136 @@ def generate_matches():
         raise
 
 
-def calculate_distance_for_match(match):
-    """Bereken afstand tussen kandidaat en vacature locatie."""
+# Gegeocodeerde vacature locaties een dag cachen, gedeeld tussen workers; daarna opnieuw opzoeken
+VACATURE_LOCATION_CACHE_TTL = 24 * 60 * 60
+
+
+def _vacature_location_cache_key(short_plaats, postcode):
+    """Cache sleutel voor een vacature locatie; gehasht zodat spaties geen ongeldige sleutel geven."""
+    location = f"{postcode} {short_plaats}".strip().lower()
+    return f"vacature_locatie:{hashlib.sha256(location.encode('utf-8')).hexdigest()}"
+
+
+def _geocode_vacature_location(short_plaats, postcode):
+    """
+    Geocode een vacature locatie naar (lat, lon), met het resultaat een dag in de cache.
+
+    Vacatures delen vaak dezelfde locatie, zodat elke plaats/postcode maar één keer per dag
+    extern opgezocht wordt.
+
+    Raises:
+        LookupError: Als de locatie niet gevonden kan worden; mislukte pogingen worden
+            niet gecached en bij een volgende berekening opnieuw geprobeerd
+    """
+    cache_key = _vacature_location_cache_key(short_plaats, postcode)
+    location = cache.get(cache_key)
+    if location is None:
+        location = _lookup_vacature_location(short_plaats, postcode)
+        cache.set(cache_key, location, VACATURE_LOCATION_CACHE_TTL)
+    return location
+
+
+def _lookup_vacature_location(short_plaats, postcode):
+    """
+    Zoek een vacature locatie op via PDOK, met Nominatim als fallback.
+
+    Raises:
+        LookupError: Als de locatie niet gevonden kan worden
+    """
+    # Probeer verschillende adres combinaties voor vacature
+    address_attempts = []
+    
+    # 1. Postcode + plaats (als beide beschikbaar)
+    if postcode:
+        address_attempts.append(f"{postcode} {short_plaats}")
+    
+    # 2. Alleen plaatsnaam (altijd als fallback)
+    address_attempts.append(short_plaats)
+    
+    lat2, lon2 = None, None
+    
+    # Probeer PDOK met verschillende adres combinaties
+    for i, address in enumerate(address_attempts):
+        if lat2 is not None and lon2 is not None:
+            break  # Al gevonden
+            
+        try:
+            logger.info(f"Vacature geocoding poging {i+1}: {address}")
+            pdok_url = "https://api.pdok.nl/bzk/locatieserver/search/v3_1/suggest"
+            params = {
+                'fl': 'weergavenaam,centroide_ll',
+                'q': address,
+                'rows': 1
+            }
+            
+            response = requests.get(pdok_url, params=params, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('response', {}).get('docs'):
+                    doc = data['response']['docs'][0]
+                    if 'centroide_ll' in doc:
+                        centroide = doc['centroide_ll']
+                        if centroide.startswith('POINT('):
+                            coords = centroide[6:-1]
+                            lon2, lat2 = coords.split(' ')
+                        else:
+                            lat2, lon2 = centroide.split(' ')
+                        lat2, lon2 = float(lat2), float(lon2)
+                        logger.info(f"Vacature geocoding succesvol met: {address}")
+                        break
+        except Exception as e:
+            logger.warning(f"Vacature geocoding gefaald met '{address}': {str(e)}")
+            continue
+    
+    # Fallback naar Nominatim
+    if lat2 is None or lon2 is None:
+        for i, address in enumerate(address_attempts):
+            if lat2 is not None and lon2 is not None:
+                break  # Al gevonden
+                
+            try:
+                logger.info(f"Vacature Nominatim poging {i+1}: {address}")
+                nominatim_url = "https://nominatim.openstreetmap.org/search"
+                params = {
+                    'q': address,
+                    'format': 'json',
+                    'limit': 1,
+                    'countrycodes': 'nl'
+                }
+                
+                response = _nominatim_get(nominatim_url, params=params, timeout=10)
+                if response.status_code == 200:
+                    data = response.json()
+                    if data:
+                        lat2 = float(data[0]['lat'])
+                        lon2 = float(data[0]['lon'])
+                        logger.info(f"Vacature Nominatim succesvol met: {address}")
+                        break
+            except Exception as e:
+                logger.warning(f"Vacature Nominatim gefaald met '{address}': {str(e)}")
+                continue
+    
+    if not lat2 or not lon2:
+        raise LookupError(short_plaats)
+    
+    return lat2, lon2
+
+
+def calculate_distance_for_match(match, geocode=True):
+    """
+    Bereken afstand tussen kandidaat en vacature locatie.
+    
+    Met geocode=False wordt alleen een al gecachte vacature locatie gebruikt en geen externe
+    API aangeroepen; is de locatie nog niet bekend, dan is het resultaat None.
+    """
     import math
-    import requests
     
     try:
-        # Haal coördinaten op voor kandidaat
+        # Haal coördinaten op voor kandidaat; zonder coördinaten heeft geocoden van de vacature geen zin
         lat1, lon1 = match.kandidaat.latitude, match.kandidaat.longitude
+        if not lat1 or not lon1:
+            logger.warning(f"Ontbrekende coördinaten voor kandidaat van match {match.id}")
+            return None
         
         # Geocode vacature plaatsnaam naar coördinaten
         vacature_plaats = match.vacature.plaats
@@ -973,83 +1356,20 @@ def calculate_distance_for_match(match):
             logger.warning(f"Geen plaatsnaam voor vacature {match.vacature.id}")
             return None
         
-        # Probeer verschillende adres combinaties voor vacature
-        address_attempts = []
-        
-        # 1. Postcode + plaats (als beide beschikbaar)
-        if vacature_postcode:
-            formatted_postcode = vacature_postcode.replace(' ', '')
-            address_attempts.append(f"{formatted_postcode} {short_plaats}")
-        
-        # 2. Alleen plaatsnaam (altijd als fallback)
-        address_attempts.append(short_plaats)
-        
-        lat2, lon2 = None, None
-        
-        # Probeer PDOK met verschillende adres combinaties
-        for i, address in enumerate(address_attempts):
-            if lat2 is not None and lon2 is not None:
-                break  # Al gevonden
-                
+        # Vacatures delen vaak dezelfde locatie: elke plaats/postcode wordt uit de cache gehaald
+        postcode = vacature_postcode.replace(' ', '') if vacature_postcode else ''
+        if not geocode:
+            # Alleen een al bekende locatie gebruiken, zonder externe API aanroep
+            location = cache.get(_vacature_location_cache_key(short_plaats, postcode))
+            if location is None:
+                return None
+            lat2, lon2 = location
+        else:
             try:
-                logger.info(f"Vacature geocoding poging {i+1}: {address}")
-                pdok_url = "https://api.pdok.nl/bzk/locatieserver/search/v3_1/suggest"
-                params = {
-                    'fl': 'weergavenaam,centroide_ll',
-                    'q': address,
-                    'rows': 1
-                }
-                
-                response = requests.get(pdok_url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('response', {}).get('docs'):
-                        doc = data['response']['docs'][0]
-                        if 'centroide_ll' in doc:
-                            centroide = doc['centroide_ll']
-                            if centroide.startswith('POINT('):
-                                coords = centroide[6:-1]
-                                lon2, lat2 = coords.split(' ')
-                            else:
-                                lat2, lon2 = centroide.split(' ')
-                            lat2, lon2 = float(lat2), float(lon2)
-                            logger.info(f"Vacature geocoding succesvol met: {address}")
-                            break
-            except Exception as e:
-                logger.warning(f"Vacature geocoding gefaald met '{address}': {str(e)}")
-                continue
-        
-        # Fallback naar Nominatim
-        if lat2 is None or lon2 is None:
-            for i, address in enumerate(address_attempts):
-                if lat2 is not None and lon2 is not None:
-                    break  # Al gevonden
-                    
-                try:
-                    logger.info(f"Vacature Nominatim poging {i+1}: {address}")
-                    nominatim_url = "https://nominatim.openstreetmap.org/search"
-                    params = {
-                        'q': address,
-                        'format': 'json',
-                        'limit': 1,
-                        'countrycodes': 'nl'
-                    }
-                    
-                    response = requests.get(nominatim_url, params=params, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data:
-                            lat2 = float(data[0]['lat'])
-                            lon2 = float(data[0]['lon'])
-                            logger.info(f"Vacature Nominatim succesvol met: {address}")
-                            break
-                except Exception as e:
-                    logger.warning(f"Vacature Nominatim gefaald met '{address}': {str(e)}")
-                    continue
-        
-        if not lat2 or not lon2:
-            logger.warning(f"Kon vacature plaats {vacature_plaats} niet geocoderen")
-            return None
+                lat2, lon2 = _geocode_vacature_location(short_plaats, postcode)
+            except LookupError:
+                logger.warning(f"Kon vacature plaats {vacature_plaats} niet geocoderen")
+                return None
         
         if not all([lat1, lon1, lat2, lon2]):
             logger.warning(f"Ontbrekende coördinaten voor match {match.id}")
@@ -1117,7 +1437,7 @@ def geocode_place(place_name):
             'countrycodes': 'nl'
         }
         
-        response = requests.get(nominatim_url, params=params, timeout=5)
+        response = _nominatim_get(nominatim_url, params=params, timeout=5)
         if response.status_code == 200:
             data = response.json()
             if data:
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from .views import LOGIN_RATE_LIMIT
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class LoginRateLimitTests(TestCase):
+    """Login rate limit per IP adres."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rate_limit_ignores_forged_forwarded_for(self):
+        """Een per poging wisselend vervalst X-Forwarded-For adres omzeilt de limiet niet."""
+        statuses = [
+            self.client.post(
+                '/login/',
+                {'username': 'onbekend', 'password': 'fout'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{attempt}, 203.0.113.7',
+            ).status_code
+            for attempt in range(LOGIN_RATE_LIMIT + 2)
+        ]
+
+        self.assertEqual(statuses[:LOGIN_RATE_LIMIT], [200] * LOGIN_RATE_LIMIT)
+        self.assertEqual(statuses[LOGIN_RATE_LIMIT:], [429, 429])
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_rate_limit_uses_address_of_outermost_trusted_proxy(self):
+        """Met twee proxies telt het adres dat de eerste proxy toevoegde, niet dat van de tweede."""
+        statuses = [
+            self.client.post(
+                '/login/',
+                {'username': 'onbekend', 'password': 'fout'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.9, 198.51.100.{attempt}, 203.0.113.7',
+            ).status_code
+            for attempt in range(LOGIN_RATE_LIMIT + 2)
+        ]
+
+        self.assertEqual(statuses, [200] * (LOGIN_RATE_LIMIT + 2))
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_rate_limit_without_proxy_uses_remote_addr(self):
+        """Zonder vertrouwde proxy wordt X-Forwarded-For genegeerd."""
+        statuses = [
+            self.client.post(
+                '/login/',
+                {'username': 'onbekend', 'password': 'fout'},
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{attempt}',
+            ).status_code
+            for attempt in range(LOGIN_RATE_LIMIT + 2)
+        ]
+
+        self.assertEqual(statuses[LOGIN_RATE_LIMIT:], [429, 429])
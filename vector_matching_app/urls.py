@@ -8,6 +8,7 @@ urlpatterns = [
     path('healthz', views.health_check, name='health_check'),
     path('kandidaten/', views.kandidaten_list_view, name='kandidaten'),
     path('kandidaten/upload/', views.kandidaten_upload_view, name='kandidaten_upload'),
+    path('kandidaten/status/', views.kandidaten_status_view, name='kandidaten_status'),
     path('kandidaten/<int:candidate_id>/', views.kandidaat_detail_view, name='kandidaat_detail'),
     path('kandidaten/<int:candidate_id>/reprocess/', views.kandidaat_reprocess_view, name='kandidaat_reprocess'),
     path('kandidaten/<int:candidate_id>/cv/', views.kandidaat_cv_view, name='kandidaat_cv'),
@@ -23,6 +24,7 @@ urlpatterns = [
     path('vacatures/<int:vacature_id>/reprocess/', views.vacature_reprocess_view, name='vacature_reprocess'),
     path('vacatures/bulk-reprocess/', views.vacatures_bulk_reprocess_view, name='vacatures_bulk_reprocess'),
     path('vacatures/update/', views.vacatures_update_view, name='vacatures_update'),
+    path('vacatures/update/status/', views.vacatures_update_status_view, name='vacatures_update_status'),
     
     # Matching URLs
     path('matching/', views.matching_view, name='matching'),
@@ -1,33 +1,54 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponse
-from django.db import connection, models
+from django.http import FileResponse, JsonResponse, HttpResponse
+from django.db import connection, models, transaction
 from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.core.cache import cache
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
-from .models import Candidate, Prompt, PromptLog, Vacature
-from .tasks import process_candidate_pipeline, reprocess_candidate
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import etag, require_http_methods
+from .models import Candidate, Match, Prompt, PromptLog, Vacature
+from .services.background import fan_out
+from .services.vacature_feed import (
+    FEED_PARSE_ERRORS, FEED_SYNC_LOCK_CACHE_KEY, FEED_SYNC_LOCK_TTL, FEED_SYNC_RESULT_CACHE_KEY,
+    sync_vacatures_from_feed
+)
+from .tasks import (
+    batch_reprocess_candidates, calculate_distance_for_match, delete_cv_files, generate_matches,
+    geocode_candidates, get_postcode_for_city, process_candidate_batch,
+    reprocess_candidate, reprocess_vacature_embedding, update_vacatures_from_feed
+)
+import hashlib
 import json
 import os
 import logging
+import re
 import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime
+from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Dashboard tellingen kort cachen, zodat niet elke paginaweergave beide tabellen telt
+DASHBOARD_COUNTS_CACHE_KEY = 'dashboard_counts'
+DASHBOARD_COUNTS_CACHE_TTL = 60
+
+
+def _dashboard_counts():
+    """Aantal kandidaten en actieve vacatures voor het dashboard."""
+    return Candidate.objects.count(), Vacature.objects.filter(actief=True).count()
+
 
 @login_required
 def index(request):
     """Dashboard met overzicht van kandidaten en systeem status."""
-    from datetime import datetime, timedelta
-    
-    # Haal statistieken op
-    total_candidates = Candidate.objects.count()
-    total_vacatures = Vacature.objects.filter(actief=True).count()
+    total_candidates, total_vacatures = cache.get_or_set(
+        DASHBOARD_COUNTS_CACHE_KEY, _dashboard_counts, DASHBOARD_COUNTS_CACHE_TTL
+    )
     
     # Fictieve matches (voor later implementatie)
     total_matches = 0  # TODO: Implementeer echte match logica
@@ -35,8 +56,10 @@ def index(request):
     # Laatste match update (fictief voor nu)
     last_match_update = datetime.now() - timedelta(hours=2)  # TODO: Implementeer echte match tracking
     
-    # Haal recente kandidaten op (laatste 10)
-    recent_candidates = Candidate.objects.order_by('-updated_at')[:10]
+    # Haal recente kandidaten op (laatste 10), zonder CV tekst en embedding
+    recent_candidates = Candidate.objects.only(
+        'id', 'name', 'email', 'embed_status', 'updated_at'
+    ).order_by('-updated_at')[:10]
     
     # Health check data
     health_status = {
@@ -58,8 +81,17 @@ def index(request):
 
 
 # Health check heeft geen login vereist voor monitoring
+# Health check resultaat kort cachen, zodat load balancer probes niet elke keer de database raken
+HEALTH_CHECK_CACHE_KEY = 'health_check'
+HEALTH_CHECK_CACHE_TTL = 3
+
+
 def health_check(request):
     """Health check endpoint dat JSON status teruggeeft."""
+    cached = cache.get(HEALTH_CHECK_CACHE_KEY)
+    if cached:
+        return JsonResponse(cached)
+    
     try:
         # Test database connectivity
         with connection.cursor() as cursor:
@@ -81,20 +113,66 @@ def health_check(request):
         "debug": settings.DEBUG,
     }
     
+    cache.set(HEALTH_CHECK_CACHE_KEY, response_data, HEALTH_CHECK_CACHE_TTL)
     return JsonResponse(response_data)
 
 
+# Aantal kandidaten per pagina in het overzicht
+KANDIDATEN_PAGE_SIZE = 50
+
+
+def _parse_kandidaten_cursor(cursor):
+    """Zet een cursor '<created_at>_<id>' om naar (created_at, id), of None als hij ongeldig is."""
+    try:
+        created_at, candidate_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(candidate_id)
+    except (AttributeError, ValueError):
+        return None
+
+
 @login_required
 def kandidaten_list_view(request):
-    """Weergave van alle kandidaten in een tabel."""
-    candidates = Candidate.objects.all()
-    total_count = candidates.count()
+    """Weergave van alle kandidaten in een tabel, gepagineerd met een keyset cursor."""
+    # Alleen de kolommen die de tabel toont; cv_text, profile_text en embedding blijven achterwege
+    candidates = Candidate.objects.only(
+        'id', 'name', 'email', 'education_level', 'years_experience',
+        'city', 'latitude', 'longitude', 'embed_status', 'created_at'
+    ).order_by('-created_at', '-id')
+    
+    # Keyset paginatie op (created_at, id): elke pagina kost evenveel, ongeacht de diepte
+    cursor = _parse_kandidaten_cursor(request.GET.get('cursor'))
+    if cursor:
+        created_at, candidate_id = cursor
+        candidates = candidates.filter(
+            models.Q(created_at__lt=created_at) | models.Q(created_at=created_at, id__lt=candidate_id)
+        )
+    
+    # Eén rij extra ophalen om te weten of er een volgende pagina is
+    candidates = list(candidates[:KANDIDATEN_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(candidates) > KANDIDATEN_PAGE_SIZE:
+        candidates = candidates[:KANDIDATEN_PAGE_SIZE]
+        last = candidates[-1]
+        next_cursor = f"{last.created_at.isoformat()}_{last.id}"
+    
+    # Alleen tellen als de eerste pagina niet alle kandidaten bevat
+    if cursor or next_cursor:
+        total_count = Candidate.objects.count()
+    else:
+        total_count = len(candidates)
+    
     return render(request, 'kandidaten.html', {
         'candidates': candidates,
-        'total_count': total_count
+        'total_count': total_count,
+        'next_cursor': next_cursor,
+        'is_first_page': cursor is None,
     })
 
 
+# Aantal geüploade kandidaten per achtergrondtaak; hun embeddings gaan in één OpenAI call
+UPLOAD_PIPELINE_BATCH_SIZE = 16
+
+
 @login_required
 @require_http_methods(["POST"])
 def kandidaten_upload_view(request):
@@ -127,102 +205,75 @@ def kandidaten_upload_view(request):
                 'error': f'Alleen PDF bestanden zijn toegestaan. Ongeldige bestanden: {", ".join(invalid_files)}'
             })
         
-        # Verwerk bestanden één voor één
+        # Sla de bestanden op; de verwerking draait op de achtergrond
         created_candidates = []
         skipped_duplicates = []
         processing_errors = []
         
         try:
-            for i, file in enumerate(files):
+            # Hash de bestanden vooraf, zodat dubbele CV's niet opnieuw naar OpenAI gaan
+            file_hashes = {}
+            for file in files:
+                sha256 = hashlib.sha256()
+                for chunk in file.chunks():
+                    sha256.update(chunk)
+                file.seek(0)
+                file_hashes[file] = sha256.hexdigest()
+            
+            # Mislukte en duplicaat kandidaten tellen niet mee, die CV's mogen opnieuw geüpload worden
+            existing_hashes = set(
+                Candidate.objects.filter(content_sha256__in=file_hashes.values())
+                .exclude(embed_status__in=('failed', 'duplicate'))
+                .values_list('content_sha256', flat=True)
+            )
+            
+            # Sla eerst de bestanden op in de storage, zodat een fout per bestand gemeld kan worden
+            cv_field = Candidate._meta.get_field('cv_pdf')
+            new_candidates = []
+            for file in files:
+                content_sha256 = file_hashes[file]
+                if content_sha256 in existing_hashes:
+                    skipped_duplicates.append(f'{file.name}: CV is al eerder geüpload')
+                    continue
+                
                 try:
-                    # Eerst PDF tekst extraheren om duplicaten te kunnen detecteren
-                    logger.info(f"PDF tekst extraheren voor {file.name} ({i+1}/{len(files)})")
-                    
-                    # Tijdelijke kandidaat voor PDF verwerking
-                    temp_candidate = Candidate.objects.create(
-                        name=os.path.splitext(file.name)[0] or 'Onbekend',
-                        email='',
-                        phone='',
-                        street='',
-                        house_number='',
-                        postal_code='',
-                        city='',
-                        cv_pdf=file,
-                        embed_status='processing'
-                    )
-                    
-                    # Extraheer PDF tekst
-                    try:
-                        from .tasks import extract_pdf_text
-                        extract_pdf_text(temp_candidate.id)
-                        temp_candidate.refresh_from_db()
-                        
-                        if not temp_candidate.cv_text:
-                            raise ValueError("Geen tekst gevonden in PDF")
-                            
-                    except Exception as e:
-                        logger.error(f"PDF extractie gefaald voor {file.name}: {str(e)}")
-                        temp_candidate.delete()
-                        processing_errors.append(f'{file.name}: PDF extractie gefaald - {str(e)}')
-                        continue
-                    
-                    # Parse CV data
-                    try:
-                        from .tasks import parse_cv_to_fields
-                        parse_cv_to_fields(temp_candidate.id)
-                        temp_candidate.refresh_from_db()
-                        
-                        # Check of het een duplicaat is
-                        if temp_candidate.embed_status == 'failed' and 'Duplicaat' in (temp_candidate.error_message or ''):
-                            # Verwijder duplicaat
-                            candidate_name = temp_candidate.name or file.name
-                            temp_candidate.delete()
-                            skipped_duplicates.append(f"{candidate_name} (duplicaat)")
-                            logger.info(f"Duplicaat overgeslagen: {file.name} - {temp_candidate.error_message}")
-                            continue
-                            
-                    except Exception as e:
-                        logger.error(f"CV parsing gefaald voor {file.name}: {str(e)}")
-                        temp_candidate.delete()
-                        processing_errors.append(f'{file.name}: CV parsing gefaald - {str(e)}')
-                        continue
-                    
-                    # Als we hier zijn, is het geen duplicaat - zet status terug naar queued
-                    temp_candidate.embed_status = 'queued'
-                    temp_candidate.save(update_fields=['embed_status'])
-                    candidate = temp_candidate
-                    
-                    # Verwerk de rest van de pipeline (embedding generatie)
-                    try:
-                        logger.info(f"Embedding generatie gestart voor {file.name} ({i+1}/{len(files)})")
-                        from .tasks import generate_profile_summary_text, embed_profile_text
-                        
-                        # Genereer profiel samenvatting
-                        generate_profile_summary_text(candidate.id)
-                        candidate.refresh_from_db()
-                        
-                        # Genereer embedding
-                        embed_profile_text(candidate.id)
-                        candidate.refresh_from_db()
-                        
-                        # Pauze tussen bestanden om server niet te overbelasten
-                        if i < len(files) - 1:  # Niet na het laatste bestand
-                            import time
-                            time.sleep(0.5)  # 500ms pauze tussen bestanden
-                        
-                        # Voeg toe aan succesvolle lijst
-                        created_candidates.append(candidate)
-                        logger.info(f"Verwerking voltooid voor {file.name}")
-                            
-                    except Exception as e:
-                        logger.error(f"Embedding generatie gefaald voor {file.name}: {str(e)}")
-                        processing_errors.append(f'{file.name}: {str(e)}')
-                        # Voeg toe aan created_candidates ook bij fout, zodat het geteld wordt
-                        created_candidates.append(candidate)
-                        
+                    stored_name = cv_field.storage.save(cv_field.generate_filename(None, file.name), file)
                 except Exception as e:
                     logger.error(f"Fout bij uploaden van {file.name}: {str(e)}")
                     processing_errors.append(f'{file.name}: {str(e)}')
+                    continue
+                
+                new_candidates.append(Candidate(
+                    name=os.path.splitext(file.name)[0] or 'Onbekend',
+                    email='',
+                    phone='',
+                    street='',
+                    house_number='',
+                    postal_code='',
+                    city='',
+                    cv_pdf=stored_name,
+                    content_sha256=content_sha256,
+                    embed_status='queued'
+                ))
+                existing_hashes.add(content_sha256)
+            
+            # Alle kandidaten in één INSERT, binnen een transactie zodat on_commit pas na de commit afgaat
+            try:
+                with transaction.atomic():
+                    created_candidates = Candidate.objects.bulk_create(new_candidates)
+                    
+                    # PDF extractie, parsing (incl. duplicaatcontrole), embedding en geocoding, per batch
+                    # één OpenAI embedding call; pas na de commit starten zodat de taak de kandidaten zeker kan vinden
+                    candidate_ids = [candidate.id for candidate in created_candidates]
+                    transaction.on_commit(lambda: fan_out(process_candidate_batch, (
+                        (candidate_ids[i:i + UPLOAD_PIPELINE_BATCH_SIZE],)
+                        for i in range(0, len(candidate_ids), UPLOAD_PIPELINE_BATCH_SIZE)
+                    )))
+            except Exception:
+                # Geen rijen aangemaakt: ruim de al opgeslagen bestanden weer op
+                for candidate in new_candidates:
+                    cv_field.storage.delete(candidate.cv_pdf.name)
+                raise
         
         except Exception as e:
             logger.error(f"Kritieke fout tijdens upload verwerking: {str(e)}")
@@ -238,66 +289,78 @@ def kandidaten_upload_view(request):
             'skipped_count': len(skipped_duplicates),
             'error_count': len(processing_errors),
             'created_candidates': [c.name for c in created_candidates],
+            'queued_ids': [c.id for c in created_candidates],
             'skipped_duplicates': skipped_duplicates,
             'processing_errors': processing_errors,
-            'message': f'{len(created_candidates)} CV(s) succesvol geüpload en verwerkt!'
+            'message': f'{len(created_candidates)} CV(s) geüpload, verwerking loopt op de achtergrond.'
         })
 
 
+@login_required
+@require_http_methods(["GET"])
+def kandidaten_status_view(request):
+    """Geeft de verwerkingsstatus van kandidaten terug, voor polling vanuit de interface."""
+    candidate_ids = [cid for cid in request.GET.getlist('ids') if cid.isdigit()]
+    statuses = Candidate.objects.filter(id__in=candidate_ids).values('id', 'embed_status', 'processing_step')
+    return JsonResponse({'candidates': list(statuses)})
+
+
 @login_required
 def kandidaat_detail_view(request, candidate_id):
     """Detail weergave van een kandidaat."""
-    try:
-        candidate = Candidate.objects.get(id=candidate_id)
-        return render(request, 'kandidaat_detail.html', {'candidate': candidate})
-    except Candidate.DoesNotExist:
-        messages.error(request, 'Kandidaat niet gevonden.')
-        return redirect('vector_matching_app:kandidaten')
+    candidate = get_object_or_404(Candidate, id=candidate_id)
+    return render(request, 'kandidaat_detail.html', {'candidate': candidate})
 
 
 @require_http_methods(["POST"])
 @login_required
 def kandidaat_reprocess_view(request, candidate_id):
     """Herstart de embedding voor een kandidaat."""
+    candidate = get_object_or_404(Candidate.objects.only('id', 'name'), id=candidate_id)
+    
+    # Start opnieuw embedden op de achtergrond
     try:
-        candidate = Candidate.objects.get(id=candidate_id)
-        
-        # Start opnieuw embedden (synchroon)
-        try:
-            reprocess_candidate(candidate_id)
-            messages.success(request, f'Opnieuw embedden voltooid voor {candidate.name or f"kandidaat {candidate_id}"}')
-        except Exception as e:
-            messages.error(request, f'Fout bij opnieuw embedden: {str(e)}')
-            
-    except Candidate.DoesNotExist:
-        messages.error(request, 'Kandidaat niet gevonden.')
+        reprocess_candidate.delay(candidate_id)
+        messages.success(request, f'Opnieuw embedden gestart voor {candidate.name or f"kandidaat {candidate_id}"}')
+    except Exception as e:
+        messages.error(request, f'Fout bij opnieuw embedden: {str(e)}')
     
     return redirect('vector_matching_app:kandidaat_detail', candidate_id=candidate_id)
 
 
+def _cv_etag(request, candidate_id):
+    """ETag van het CV op basis van de inhoudshash, zonder het bestand zelf te openen."""
+    return Candidate.objects.filter(id=candidate_id).values_list('content_sha256', flat=True).first() or None
+
+
 @login_required
+@etag(_cv_etag)
 def kandidaat_cv_view(request, candidate_id):
     """Serveer het CV bestand van een kandidaat."""
     try:
-        candidate = get_object_or_404(Candidate, id=candidate_id)
+        candidate = get_object_or_404(Candidate.objects.only('id', 'cv_pdf'), id=candidate_id)
         
         if not candidate.cv_pdf:
             return HttpResponse('Geen CV bestand gevonden.', status=404)
         
-        # Controleer of het bestand bestaat
-        if not candidate.cv_pdf.storage.exists(candidate.cv_pdf.name):
-            return HttpResponse('CV bestand niet gevonden op server.', status=404)
-        
-        # Serveer het bestand
+        # Serveer het bestand streamend; FileResponse zet Content-Length zelf en
+        # gebruikt wsgi.file_wrapper zodat de PDF niet in het geheugen wordt geladen.
+        # Direct openen in plaats van eerst exists(), dat scheelt een storage aanroep
         try:
-            file_content = candidate.cv_pdf.read()
-            response = HttpResponse(file_content, content_type='application/pdf')
-            response['Content-Disposition'] = f'inline; filename="{candidate.cv_pdf.name.split("/")[-1]}"'
-            response['Content-Length'] = len(file_content)
-            return response
+            response = FileResponse(
+                candidate.cv_pdf.open('rb'),
+                content_type='application/pdf',
+                filename=os.path.basename(candidate.cv_pdf.name),
+            )
+        except FileNotFoundError:
+            return HttpResponse('CV bestand niet gevonden op server.', status=404)
         except Exception as e:
             return HttpResponse(f'Fout bij lezen van CV bestand: {str(e)}', status=500)
         
+        # Alleen het CV zelf mag de browser even bewaren, een foutmelding niet
+        patch_cache_control(response, private=True, max_age=300)
+        return response
+        
     except Exception as e:
         return HttpResponse(f'Fout bij het openen van CV: {str(e)}', status=500)
 
@@ -307,17 +370,18 @@ def kandidaat_cv_view(request, candidate_id):
 def kandidaat_delete_view(request, candidate_id):
     """Verwijder een kandidaat."""
     try:
-        candidate = get_object_or_404(Candidate, id=candidate_id)
+        candidate = get_object_or_404(Candidate.objects.only('id', 'name', 'cv_pdf'), id=candidate_id)
         candidate_name = candidate.name or f"kandidaat {candidate_id}"
         
-        # Verwijder het CV bestand
-        if candidate.cv_pdf:
-            try:
-                os.remove(candidate.cv_pdf.path)
-            except (OSError, ValueError):
-                pass  # Bestand bestaat niet of kan niet worden verwijderd
+        cv_file_name = candidate.cv_pdf.name if candidate.cv_pdf else None
+        
+        with transaction.atomic():
+            candidate.delete()
+            
+            # CV bestand op de achtergrond opruimen via de storage backend, pas na een geslaagde delete
+            if cv_file_name:
+                transaction.on_commit(lambda: delete_cv_files.delay([cv_file_name]))
         
-        candidate.delete()
         messages.success(request, f'{candidate_name} is verwijderd.')
         
     except Exception as e:
@@ -326,6 +390,19 @@ def kandidaat_delete_view(request, candidate_id):
     return redirect('vector_matching_app:kandidaten')
 
 
+# Velden van een kandidaat die via het bewerkformulier aangepast kunnen worden
+CANDIDATE_EDIT_FIELDS = (
+    'name', 'email', 'phone', 'street', 'house_number',
+    'postal_code', 'city', 'education_level', 'years_experience', 'job_titles',
+)
+# Velden die ongewijzigd uit het formulier overgenomen worden
+CANDIDATE_EDIT_TEXT_FIELDS = ('name', 'email', 'phone', 'street', 'house_number', 'postal_code', 'education_level')
+# Jaren ervaring: alleen een geheel getal
+YEARS_EXPERIENCE_RE = re.compile(r'\d+', re.ASCII)
+# Nederlandse postcode: vier cijfers, optioneel gevolgd door twee letters (1234 AB, 1234AB of 1234)
+POSTAL_CODE_RE = re.compile(r'\d{4}(?: ?[A-Za-z]{2})?', re.ASCII)
+
+
 @login_required
 def kandidaat_edit_view(request, candidate_id):
     """Bewerk een kandidaat."""
@@ -333,13 +410,11 @@ def kandidaat_edit_view(request, candidate_id):
     
     if request.method == 'POST':
         try:
-            # Update de kandidaat velden
-            candidate.name = request.POST.get('name', candidate.name)
-            candidate.email = request.POST.get('email', candidate.email)
-            candidate.phone = request.POST.get('phone', candidate.phone)
-            candidate.street = request.POST.get('street', candidate.street)
-            candidate.house_number = request.POST.get('house_number', candidate.house_number)
-            candidate.postal_code = request.POST.get('postal_code', candidate.postal_code)
+            original_values = {field: getattr(candidate, field) for field in CANDIDATE_EDIT_FIELDS}
+            
+            # Update de tekstvelden die ongewijzigd uit het formulier overgenomen worden
+            for field in CANDIDATE_EDIT_TEXT_FIELDS:
+                setattr(candidate, field, request.POST.get(field, getattr(candidate, field)))
             
             # Voor city: sla de volledige naam op als die beschikbaar is via hidden field
             city_input = request.POST.get('city', candidate.city)
@@ -349,58 +424,45 @@ def kandidaat_edit_view(request, candidate_id):
                 candidate.city = city_full  # Sla volledige naam op voor geocoding
             else:
                 candidate.city = city_input  # Gebruik ingevoerde naam
-                
-            candidate.education_level = request.POST.get('education_level', candidate.education_level)
+            
+            # Valideer de postcode; leeg is toegestaan
+            candidate.postal_code = (candidate.postal_code or '').strip()
+            if candidate.postal_code and not POSTAL_CODE_RE.fullmatch(candidate.postal_code):
+                messages.error(request, f'Ongeldige postcode: {candidate.postal_code}. Gebruik het formaat 1234 AB.')
+                return render(request, 'kandidaat_edit.html', {'candidate': candidate})
             
             # Parse jaren ervaring
-            years_exp = request.POST.get('years_experience', '')
-            if years_exp.isdigit():
-                candidate.years_experience = int(years_exp)
-            else:
-                candidate.years_experience = None
+            years_exp = request.POST.get('years_experience', '').strip()
+            candidate.years_experience = int(years_exp) if YEARS_EXPERIENCE_RE.fullmatch(years_exp) else None
             
             # Parse job titles (comma separated)
             job_titles = request.POST.get('job_titles', '')
-            if job_titles:
-                candidate.job_titles = [title.strip() for title in job_titles.split(',') if title.strip()]
-            else:
-                candidate.job_titles = []
-            
-            # Sla op zonder embedding kolom (die is van type vector, niet jsonb)
-            candidate.save(update_fields=[
-                'name', 'email', 'phone', 'street', 'house_number', 
-                'postal_code', 'city', 'education_level', 'years_experience', 
-                'job_titles', 'updated_at'
-            ])
-            
-            # Auto-vul postcode als alleen plaatsnaam is ingevuld
-            new_city = request.POST.get('city', '')
-            new_postal_code = request.POST.get('postal_code', '')
-            
-            # Gebruik volledige plaatsnaam als beschikbaar
-            city_full = request.POST.get('city_full', '')
-            if city_full:
-                new_city = city_full
+            candidate.job_titles = [title.strip() for title in job_titles.split(',') if title.strip()]
             
-            if new_city and not new_postal_code:
+            # Auto-vul postcode als alleen plaatsnaam is ingevuld, vóór het opslaan zodat het één UPDATE blijft
+            suggested_postcode = None
+            if candidate.city and not candidate.postal_code:
                 try:
-                    from .tasks import get_postcode_for_city
-                    suggested_postcode = get_postcode_for_city(new_city)
+                    suggested_postcode = get_postcode_for_city(candidate.city)
                     if suggested_postcode:
                         candidate.postal_code = suggested_postcode
-                        candidate.save(update_fields=['postal_code', 'updated_at'])
-                        messages.info(request, f'Postcode {suggested_postcode} automatisch toegevoegd voor {new_city.split(",")[0].strip()}')
                 except Exception as postcode_error:
                     logger.warning(f"Auto-postcode gefaald voor kandidaat {candidate_id}: {str(postcode_error)}")
             
-            # Geocode locatie als plaats of postcode is gewijzigd
-            old_city = candidate.city
-            old_postal_code = candidate.postal_code
+            # Sla alleen de gewijzigde velden op, nooit de embedding kolom (die is van type vector, niet jsonb)
+            changed_fields = [
+                field for field in CANDIDATE_EDIT_FIELDS if getattr(candidate, field) != original_values[field]
+            ]
+            if changed_fields:
+                candidate.save(update_fields=changed_fields + ['updated_at'])
             
-            if (old_city != new_city or old_postal_code != new_postal_code) and new_city:
+            if suggested_postcode:
+                messages.info(request, f'Postcode {suggested_postcode} automatisch toegevoegd voor {candidate.city.split(",")[0].strip()}')
+            
+            # Geocode locatie op de achtergrond als plaats of postcode is gewijzigd
+            if candidate.city and ('city' in changed_fields or 'postal_code' in changed_fields):
                 try:
-                    from .tasks import geocode_candidate
-                    geocode_candidate(candidate_id)
+                    geocode_candidates.delay([candidate_id])
                     messages.info(request, 'Locatie wordt gegeocodeerd...')
                 except Exception as geo_error:
                     logger.warning(f"Geocoding gefaald voor kandidaat {candidate_id}: {str(geo_error)}")
@@ -426,24 +488,16 @@ def kandidaten_bulk_delete_view(request):
             messages.warning(request, 'Geen kandidaten geselecteerd.')
             return redirect('vector_matching_app:kandidaten')
         
-        # Verwijder de geselecteerde kandidaten
-        deleted_count = 0
-        for candidate_id in candidate_ids:
-            try:
-                candidate = Candidate.objects.get(id=candidate_id)
-                
-                # Verwijder het CV bestand
-                if candidate.cv_pdf:
-                    try:
-                        os.remove(candidate.cv_pdf.path)
-                    except (OSError, ValueError):
-                        pass  # Bestand bestaat niet of kan niet worden verwijderd
-                
-                candidate.delete()
-                deleted_count += 1
-                
-            except Candidate.DoesNotExist:
-                continue  # Kandidaat bestaat niet meer
+        # Eén SELECT voor de bestandsnamen en één DELETE voor alle geselecteerde kandidaten
+        with transaction.atomic():
+            candidates = Candidate.objects.filter(id__in=candidate_ids).only('id', 'cv_pdf')
+            cv_file_names = [c.cv_pdf.name for c in candidates if c.cv_pdf]
+            _, deleted_per_model = candidates.delete()
+            deleted_count = deleted_per_model.get(Candidate._meta.label, 0)
+            
+            # CV bestanden pas opruimen als het verwijderen definitief is
+            if cv_file_names:
+                transaction.on_commit(lambda: delete_cv_files.delay(cv_file_names))
         
         if deleted_count > 0:
             messages.success(request, f'{deleted_count} kandidaat(en) succesvol verwijderd.')
@@ -456,6 +510,10 @@ def kandidaten_bulk_delete_view(request):
     return redirect('vector_matching_app:kandidaten')
 
 
+# Aantal kandidaten per achtergrondtaak bij bulk opnieuw embedden
+BULK_REPROCESS_BATCH_SIZE = 50
+
+
 @require_http_methods(["POST"])
 @login_required
 def kandidaten_bulk_reprocess_view(request):
@@ -467,44 +525,35 @@ def kandidaten_bulk_reprocess_view(request):
             messages.warning(request, 'Geen kandidaten geselecteerd.')
             return redirect('vector_matching_app:kandidaten')
         
-        processed_count = 0
-        failed_count = 0
+        # Alle geselecteerde kandidaten in één query ophalen en controleren
+        candidates = Candidate.objects.only('id', 'name', 'cv_text').in_bulk(
+            [int(candidate_id) for candidate_id in candidate_ids if candidate_id.isdigit()]
+        )
         failed_candidates = []
+        reprocess_ids = []
         
         for candidate_id in candidate_ids:
-            try:
-                candidate = Candidate.objects.get(id=candidate_id)
-                
-                # Controleer of CV tekst beschikbaar is
-                if not candidate.cv_text:
-                    failed_count += 1
-                    failed_candidates.append(f"{candidate.name or f'Kandidaat {candidate_id}'}: Geen CV tekst")
-                    continue
-                
-                # Start opnieuw embedden
-                reprocess_candidate(candidate_id)
-                processed_count += 1
-                
-                # Korte pauze tussen kandidaten
-                import time
-                time.sleep(0.5)
-                
-            except Candidate.DoesNotExist:
-                failed_count += 1
+            candidate = candidates.get(int(candidate_id)) if candidate_id.isdigit() else None
+            if candidate is None:
                 failed_candidates.append(f"Kandidaat {candidate_id}: Niet gevonden")
-                continue
-            except Exception as e:
-                failed_count += 1
-                candidate_name = candidate.name if 'candidate' in locals() else f"Kandidaat {candidate_id}"
-                failed_candidates.append(f"{candidate_name}: {str(e)}")
-                continue
+            elif not candidate.cv_text:
+                failed_candidates.append(f"{candidate.name or f'Kandidaat {candidate_id}'}: Geen CV tekst")
+            else:
+                reprocess_ids.append(candidate.id)
+        
+        # Start opnieuw embedden op de achtergrond; per batch één OpenAI embedding call
+        fan_out(batch_reprocess_candidates, (
+            (reprocess_ids[i:i + BULK_REPROCESS_BATCH_SIZE],)
+            for i in range(0, len(reprocess_ids), BULK_REPROCESS_BATCH_SIZE)
+        ))
+        processed_count = len(reprocess_ids)
         
         # Toon resultaten
         if processed_count > 0:
-            messages.success(request, f'{processed_count} kandidaat(en) succesvol opnieuw geëmbedded.')
+            messages.success(request, f'Opnieuw embedden gestart voor {processed_count} kandidaat(en).')
         
-        if failed_count > 0:
-            error_msg = f'{failed_count} kandidaat(en) gefaald: ' + '; '.join(failed_candidates[:3])
+        if failed_candidates:
+            error_msg = f'{len(failed_candidates)} kandidaat(en) gefaald: ' + '; '.join(failed_candidates[:3])
             if len(failed_candidates) > 3:
                 error_msg += f' (en {len(failed_candidates) - 3} meer)'
             messages.error(request, error_msg)
@@ -526,45 +575,29 @@ def kandidaten_bulk_geocode_view(request):
             messages.warning(request, 'Geen kandidaten geselecteerd.')
             return redirect('vector_matching_app:kandidaten')
         
-        processed_count = 0
-        failed_count = 0
+        # Alle geselecteerde kandidaten in één query ophalen en controleren
+        candidates = Candidate.objects.only('id', 'name', 'city').in_bulk(
+            [int(candidate_id) for candidate_id in candidate_ids if candidate_id.isdigit()]
+        )
+        geocode_ids = []
         failed_candidates = []
         
         for candidate_id in candidate_ids:
-            try:
-                candidate = Candidate.objects.get(id=candidate_id)
-                
-                # Controleer of kandidaat een plaats heeft
-                if not candidate.city:
-                    failed_count += 1
-                    failed_candidates.append(f"{candidate.name or f'Kandidaat {candidate_id}'}: Geen plaats opgegeven")
-                    continue
-                
-                # Start geocoding
-                from .tasks import geocode_candidate
-                geocode_candidate(candidate_id)
-                processed_count += 1
-                
-                # Korte pauze tussen kandidaten
-                import time
-                time.sleep(0.5)
-                
-            except Candidate.DoesNotExist:
-                failed_count += 1
+            candidate = candidates.get(int(candidate_id)) if candidate_id.isdigit() else None
+            if candidate is None:
                 failed_candidates.append(f"Kandidaat {candidate_id}: Niet gevonden")
-                continue
-            except Exception as e:
-                failed_count += 1
-                candidate_name = candidate.name if 'candidate' in locals() else f"Kandidaat {candidate_id}"
-                failed_candidates.append(f"{candidate_name}: {str(e)}")
-                continue
+            elif not candidate.city:
+                failed_candidates.append(f"{candidate.name or f'Kandidaat {candidate_id}'}: Geen plaats opgegeven")
+            else:
+                geocode_ids.append(candidate.id)
         
-        # Toon resultaten
-        if processed_count > 0:
-            messages.success(request, f'{processed_count} kandidaat(en) succesvol gegeocodeerd.')
+        # Start geocoding op de achtergrond; de taak houdt zelf rekening met de Nominatim limiet
+        if geocode_ids:
+            geocode_candidates.delay(geocode_ids)
+            messages.success(request, f'Geocoding gestart voor {len(geocode_ids)} kandidaat(en).')
         
-        if failed_count > 0:
-            error_msg = f'{failed_count} kandidaat(en) gefaald: ' + ', '.join(failed_candidates[:3])
+        if failed_candidates:
+            error_msg = f'{len(failed_candidates)} kandidaat(en) gefaald: ' + ', '.join(failed_candidates[:3])
             if len(failed_candidates) > 3:
                 error_msg += f' (en {len(failed_candidates) - 3} meer)'
             messages.error(request, error_msg)
@@ -579,85 +612,26 @@ def kandidaten_bulk_geocode_view(request):
 @login_required
 def prompts_list_view(request):
     """Overzicht van alle prompts - alleen unieke prompts per naam."""
-    # Zorg ervoor dat de standaard prompts bestaan
-    _ensure_default_prompts()
-    
-    # Haal alleen de nieuwste versie van elke unieke prompt op
-    prompts = Prompt.objects.filter(
-        id__in=Prompt.objects.values('name').annotate(
-            latest_id=models.Max('id')
-        ).values_list('latest_id', flat=True)
-    ).order_by('name')
+    # Haal alleen de nieuwste versie van elke unieke prompt op, met het aantal versies per naam,
+    # in één query via window functies (werkt op PostgreSQL en SQLite, anders dan DISTINCT ON)
+    prompts = Prompt.objects.annotate(
+        latest_id=models.Window(models.Max('id'), partition_by=[models.F('name')]),
+        version_count=models.Window(models.Count('id'), partition_by=[models.F('name')]),
+    ).filter(id=models.F('latest_id')).order_by('name')
     
     return render(request, 'prompts.html', {'prompts': prompts})
 
 
-def _ensure_default_prompts():
-    """Zorg ervoor dat de standaard prompts bestaan."""
-    # Kandidaten Samenvatting Prompt
-    if not Prompt.objects.filter(prompt_type='profile_summary').exists():
-        Prompt.objects.create(
-            name='Kandidaten Samenvatting',
-            prompt_type='profile_summary',
-            content="""Schrijf één zakelijke Nederlandse alinea (80–140 woorden) die de kandidaat samenvat voor matching. Benoem opleiding, jaren ervaring, functietitels, domeinen, vaardigheden, talen, beschikbaarheid. Gebruik alleen info uit de CV.
-
-CV tekst:
-""",
-            is_active=True
-        )
-    
-    # Vacature Samenvatting Prompt
-    if not Prompt.objects.filter(prompt_type='vacature_summary').exists():
-        Prompt.objects.create(
-            name='Vacature Samenvatting',
-            prompt_type='vacature_summary',
-            content="""Schrijf één zakelijke Nederlandse alinea (80–140 woorden) die de vacature samenvat voor matching met kandidaten. Focus vooral op:
-
-1. Functietitel en niveau
-2. Belangrijkste eisen en kwalificaties
-3. Verantwoordelijkheden en taken
-4. Gewenste ervaring en opleiding
-5. Vaardigheden en competenties
-6. Locatie en arbeidsvoorwaarden (indien relevant)
-
-Gebruik alleen informatie uit de vacaturetekst. Maak het geschikt voor matching met kandidatenprofielen.
-
-Vacature tekst:
-""",
-            is_active=True
-        )
-    
-    # CV Parsing Prompt
-    if not Prompt.objects.filter(prompt_type='cv_parsing').exists():
-        Prompt.objects.create(
-            name='CV Parsing',
-            prompt_type='cv_parsing',
-            content="""Je bent een NL data-extractie-assistent. Antwoord uitsluitend met JSON met deze sleutels:
-{ "volledige_naam": "...", "email": "...", "telefoonnummer": "...", "straat": "...", "huisnummer": "...", "postcode": "...", "woonplaats": "...", "opleidingsniveau": "...", "functietitels": ["..."], "jaren_ervaring": 0 }
-
-BELANGRIJK voor opleidingsniveau: Gebruik ALTIJD één van deze categorieën:
-- VMBO (voor VMBO, LBO, VBO)
-- HAVO (voor HAVO, 5-jarig HAVO)
-- VWO (voor VWO, Atheneum, Gymnasium)
-- MBO (voor MBO, ROC, niveau 2/3/4)
-- HBO (voor HBO, Hogeschool, Bachelor)
-- WO (voor WO, Universiteit, Master, PhD)
-- Overige (voor alle andere opleidingen)
-
-CV tekst:
-""",
-            is_active=True
-        )
-
-
 @login_required
 def prompt_detail_view(request, prompt_id):
     """Detail weergave van een prompt met versiegeschiedenis."""
-    prompt = get_object_or_404(Prompt, id=prompt_id)
+    prompt = get_object_or_404(Prompt.objects.select_related('created_by'), id=prompt_id)
     
-    # Haal alle versies op van deze prompt (op basis van naam)
-    versions = Prompt.objects.filter(name=prompt.name).order_by('-version')
-    logs = PromptLog.objects.filter(prompt__in=versions).order_by('-timestamp')[:20]
+    # Haal alle versies op van deze prompt (op basis van naam), één keer geëvalueerd
+    versions = list(Prompt.objects.filter(name=prompt.name).order_by('-version'))
+    logs = PromptLog.objects.filter(
+        prompt_id__in=[version.id for version in versions]
+    ).select_related('user').order_by('-timestamp')[:20]
     
     context = {
         'prompt': prompt,
@@ -740,20 +714,29 @@ def prompt_activate_view(request, prompt_id):
     prompt = get_object_or_404(Prompt, id=prompt_id)
     
     if request.method == 'POST':
-        # Deactiveer alle andere versies van dezelfde prompt
-        Prompt.objects.filter(name=prompt.name).update(is_active=False)
-        
-        # Activeer deze versie
-        prompt.is_active = True
-        prompt.save()
-        
-        # Log de activatie
-        PromptLog.objects.create(
-            prompt=prompt,
-            action='activated',
-            user=request.user,
-            notes=f'Versie {prompt.version} geactiveerd'
-        )
+        with transaction.atomic():
+            # Activeer deze versie en deactiveer alle andere versies van dezelfde prompt in één UPDATE,
+            # zodat er geen moment is waarop geen enkele versie actief is
+            Prompt.objects.filter(name=prompt.name).update(
+                is_active=models.Case(
+                    models.When(id=prompt.id, then=models.Value(True)),
+                    default=models.Value(False),
+                    output_field=models.BooleanField(),
+                ),
+                updated_at=models.Case(
+                    models.When(id=prompt.id, then=models.Value(timezone.now())),
+                    default=models.F('updated_at'),
+                ),
+            )
+            prompt.is_active = True
+            
+            # Log de activatie
+            PromptLog.objects.create(
+                prompt=prompt,
+                action='activated',
+                user=request.user,
+                notes=f'Versie {prompt.version} geactiveerd'
+            )
         
         messages.success(request, f'Versie {prompt.version} van "{prompt.name}" is geactiveerd.')
     
@@ -763,7 +746,11 @@ def prompt_activate_view(request, prompt_id):
 @login_required
 def prompt_logs_view(request):
     """Overzicht van alle prompt logs."""
-    logs = PromptLog.objects.all().order_by('-timestamp')[:100]
+    # Alleen de kolommen die de tabel toont, zonder prompt inhoud en gebruikersgegevens
+    logs = PromptLog.objects.select_related('prompt', 'user').only(
+        'id', 'action', 'timestamp', 'notes',
+        'prompt__id', 'prompt__name', 'prompt__version', 'user__username',
+    ).order_by('-timestamp')[:100]
     return render(request, 'prompt_logs.html', {'logs': logs})
 
 
@@ -771,8 +758,16 @@ def prompt_logs_view(request):
 @login_required
 def vacatures_list_view(request):
     """Overzicht van alle vacatures."""
-    vacatures = Vacature.objects.filter(actief=True)
-    total_count = vacatures.count()
+    # Eén keer evalueren; de template itereert toch over alle rijen, dus geen aparte COUNT.
+    # Alleen de getoonde kolommen, zonder beschrijving en zonder de embedding zelf op te halen
+    vacatures = list(Vacature.objects.filter(actief=True).only(
+        'id', 'titel', 'organisatie', 'plaats', 'postcode', 'url', 'actief'
+    ).annotate(
+        has_embedding=models.ExpressionWrapper(
+            models.Q(embedding__isnull=False), output_field=models.BooleanField()
+        )
+    ))
+    total_count = len(vacatures)
     
     return render(request, 'vacatures.html', {
         'vacatures': vacatures,
@@ -783,142 +778,52 @@ def vacatures_list_view(request):
 @require_http_methods(["POST"])
 @login_required
 def vacatures_update_view(request):
-    """Update vacatures via de XML feed."""
-    try:
-        # Verwijder eerst alle demo vacatures (zonder externe_id)
-        demo_vacatures = Vacature.objects.filter(externe_id__isnull=True) | Vacature.objects.filter(externe_id="temp")
-        demo_count = demo_vacatures.count()
-        if demo_count > 0:
-            demo_vacatures.delete()
-            logger.info(f"{demo_count} demo vacatures verwijderd")
-        
-        # Haal XML feed op
-        feed_url = "https://noordtalent.nl/werkzoeken-feed.xml"
-        response = requests.get(feed_url, timeout=30)
-        response.raise_for_status()
-        
-        # Parse XML
-        root = ET.fromstring(response.content)
-        
-        # Teller voor statistieken
-        toegevoegd = 0
-        bijgewerkt = 0
-        gedeactiveerd = 0
-        fouten = 0
-        
-        # Verzamel alle externe IDs uit de feed
-        feed_externe_ids = set()
-        
-        # Verwerk elke vacature in de feed
-        for item in root.findall('.//vacature'):
-            try:
-                # Haal velden op
-                externe_id = item.find('id').text if item.find('id') is not None else None
-                title = item.find('title').text if item.find('title') is not None else ""
-                url = item.find('url').text if item.find('url') is not None else ""
-                company = item.find('company').text if item.find('company') is not None else ""
-                city = item.find('city').text if item.find('city') is not None else ""
-                zipcode = item.find('zipcode').text if item.find('zipcode') is not None else ""
-                description = item.find('description').text if item.find('description') is not None else ""
-                
-                if not externe_id:
-                    continue
-                    
-                feed_externe_ids.add(externe_id)
-                
-                # Probeer vacature te vinden of maak nieuwe aan
-                vacature, created = Vacature.objects.get_or_create(
-                    externe_id=externe_id,
-                    defaults={
-                        'titel': title,
-                        'organisatie': company,
-                        'plaats': city,
-                        'postcode': zipcode,
-                        'url': url,
-                        'beschrijving': description,
-                        'actief': True
-                    }
-                )
-                
-                if created:
-                    toegevoegd += 1
-                    logger.info(f"Vacature toegevoegd: {title} - {company}")
-                else:
-                    # Update bestaande vacature
-                    vacature.titel = title
-                    vacature.organisatie = company
-                    vacature.plaats = city
-                    vacature.postcode = zipcode
-                    vacature.url = url
-                    vacature.beschrijving = description
-                    vacature.actief = True
-                    vacature.save()
-                    bijgewerkt += 1
-                    logger.info(f"Vacature bijgewerkt: {title} - {company}")
-                    
-            except Exception as e:
-                fouten += 1
-                logger.error(f"Fout bij verwerken vacature: {str(e)}")
-                continue
-        
-        # Markeer vacatures die niet meer in de feed staan als inactief
-        inactive_vacatures = Vacature.objects.filter(actief=True).exclude(externe_id__in=feed_externe_ids)
-        for vacature in inactive_vacatures:
-            vacature.actief = False
-            vacature.save()
-            gedeactiveerd += 1
-            logger.info(f"Vacature gedeactiveerd: {vacature.titel} - {vacature.organisatie}")
-        
-        # Check if this is an AJAX request
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            from django.http import JsonResponse
-            return JsonResponse({
-                'success': True,
-                'toegevoegd': toegevoegd,
-                'bijgewerkt': bijgewerkt,
-                'gedeactiveerd': gedeactiveerd,
-                'fouten': fouten,
-                'message': f'Vacatures bijgewerkt! Toegevoegd: {toegevoegd}, Bijgewerkt: {bijgewerkt}, Gedeactiveerd: {gedeactiveerd}'
-            })
-        
-        # Toon success message
-        messages.success(request, 
-            f'Vacatures bijgewerkt! Toegevoegd: {toegevoegd}, '
-            f'Bijgewerkt: {bijgewerkt}, '
-            f'Gedeactiveerd: {gedeactiveerd}'
-        )
-        
-    except requests.RequestException as e:
-        logger.error(f"Fout bij ophalen XML feed: {str(e)}")
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            from django.http import JsonResponse
-            return JsonResponse({
-                'success': False,
-                'error': f'Kon XML feed niet ophalen: {str(e)}'
-            })
-        messages.error(request, f'Kon XML feed niet ophalen: {str(e)}')
-    except ET.ParseError as e:
-        logger.error(f"Fout bij parsen XML: {str(e)}")
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            from django.http import JsonResponse
-            return JsonResponse({
-                'success': False,
-                'error': f'Kon XML niet parsen: {str(e)}'
-            })
-        messages.error(request, f'Kon XML niet parsen: {str(e)}')
-    except Exception as e:
-        logger.error(f"Onverwachte fout bij updaten vacatures: {str(e)}")
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            from django.http import JsonResponse
-            return JsonResponse({
-                'success': False,
-                'error': f'Onverwachte fout: {str(e)}'
-            })
-        messages.error(request, f'Onverwachte fout: {str(e)}')
+    """Start een update van de vacatures via de XML feed op de achtergrond."""
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
     
+    # Lock voorkomt dat dubbel klikken meerdere updates tegelijk start
+    if cache.add(FEED_SYNC_LOCK_CACHE_KEY, True, FEED_SYNC_LOCK_TTL):
+        # Zelfde TTL als de lock: sterft de achtergrondtaak, dan verloopt ook de 'running' status
+        cache.set(FEED_SYNC_RESULT_CACHE_KEY, {'status': 'running'}, FEED_SYNC_LOCK_TTL)
+        try:
+            update_vacatures_from_feed.delay()
+        except Exception as e:
+            cache.delete(FEED_SYNC_LOCK_CACHE_KEY)
+            cache.delete(FEED_SYNC_RESULT_CACHE_KEY)
+            logger.error(f"Kon vacature update niet starten: {str(e)}")
+            if is_ajax:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Kon vacature update niet starten: {str(e)}'
+                })
+            messages.error(request, f'Kon vacature update niet starten: {str(e)}')
+            return redirect('vector_matching_app:vacatures')
+        message = 'Vacature update gestart, dit kan even duren.'
+    else:
+        message = 'Er loopt al een vacature update.'
+    
+    if is_ajax:
+        return JsonResponse({
+            'success': True,
+            'message': message
+        })
+    
+    messages.info(request, message)
     return redirect('vector_matching_app:vacatures')
 
 
+@login_required
+@require_http_methods(["GET"])
+def vacatures_update_status_view(request):
+    """
+    Geeft de status van de laatste vacature update terug, voor polling vanuit de interface.
+
+    'idle' betekent dat deze cache geen status kent; de interface blijft dan nog even pollen.
+    Met meerdere web processen of een Celery worker is een gedeelde cache (CACHE_URL) nodig.
+    """
+    return JsonResponse(cache.get(FEED_SYNC_RESULT_CACHE_KEY) or {'status': 'idle'})
+
+
 @login_required
 def vacature_detail_view(request, vacature_id):
     """Detail pagina voor een specifieke vacature."""
@@ -935,7 +840,6 @@ def vacature_reprocess_view(request, vacature_id):
     vacature = get_object_or_404(Vacature, id=vacature_id)
     
     try:
-        from .tasks import reprocess_vacature_embedding
         reprocess_vacature_embedding(vacature_id)
         messages.success(request, f'Vacature "{vacature.titel}" succesvol opnieuw geëmbedded!')
     except Exception as e:
@@ -956,46 +860,31 @@ def vacatures_bulk_reprocess_view(request):
             messages.warning(request, 'Geen vacatures geselecteerd.')
             return redirect('vector_matching_app:vacatures')
         
-        processed_count = 0
-        failed_count = 0
+        # Alle geselecteerde vacatures in één query ophalen en controleren
+        vacatures = Vacature.objects.only('id', 'titel', 'beschrijving').in_bulk(
+            [int(vacature_id) for vacature_id in vacature_ids if vacature_id.isdigit()]
+        )
         failed_vacatures = []
+        reprocess_ids = []
         
         for vacature_id in vacature_ids:
-            try:
-                vacature = Vacature.objects.get(id=vacature_id)
-                
-                # Controleer of beschrijving beschikbaar is
-                if not vacature.beschrijving:
-                    failed_count += 1
-                    failed_vacatures.append(f"{vacature.titel or f'Vacature {vacature_id}'}: Geen beschrijving")
-                    continue
-                
-                # Start opnieuw embedden
-                from .tasks import generate_vacature_summary, generate_vacature_embedding
-                generate_vacature_summary(vacature_id)
-                generate_vacature_embedding(vacature_id)
-                processed_count += 1
-                
-                # Korte pauze tussen vacatures
-                import time
-                time.sleep(0.5)
-                
-            except Vacature.DoesNotExist:
-                failed_count += 1
+            vacature = vacatures.get(int(vacature_id)) if vacature_id.isdigit() else None
+            if vacature is None:
                 failed_vacatures.append(f"Vacature {vacature_id}: Niet gevonden")
-                continue
-            except Exception as e:
-                failed_count += 1
-                vacature_title = vacature.titel if 'vacature' in locals() else f"Vacature {vacature_id}"
-                failed_vacatures.append(f"{vacature_title}: {str(e)}")
-                continue
+            elif not vacature.beschrijving:
+                failed_vacatures.append(f"{vacature.titel or f'Vacature {vacature_id}'}: Geen beschrijving")
+            else:
+                reprocess_ids.append(vacature.id)
+        
+        # Start opnieuw embedden op de achtergrond; de rate limit zit op de taak
+        processed_count = fan_out(reprocess_vacature_embedding, ((vacature_id,) for vacature_id in reprocess_ids))
         
         # Toon resultaten
         if processed_count > 0:
-            messages.success(request, f'{processed_count} vacature(s) succesvol opnieuw geëmbedded.')
+            messages.success(request, f'Opnieuw embedden gestart voor {processed_count} vacature(s).')
         
-        if failed_count > 0:
-            error_msg = f'{failed_count} vacature(s) gefaald: ' + '; '.join(failed_vacatures[:5])
+        if failed_vacatures:
+            error_msg = f'{len(failed_vacatures)} vacature(s) gefaald: ' + '; '.join(failed_vacatures[:5])
             if len(failed_vacatures) > 5:
                 error_msg += f' ... en {len(failed_vacatures) - 5} meer'
             messages.error(request, error_msg)
@@ -1008,18 +897,55 @@ def vacatures_bulk_reprocess_view(request):
 
 
 # Authentication Views
+# Maximaal aantal inlogpogingen per IP adres binnen LOGIN_RATE_LIMIT_WINDOW seconden
+LOGIN_RATE_LIMIT = 5
+LOGIN_RATE_LIMIT_WINDOW = 60
+
+
+def _client_ip(request):
+    """
+    IP adres van de bezoeker voor de login rate limit.
+
+    Elke vertrouwde proxy voegt het IP adres dat hij ziet achteraan X-Forwarded-For toe; de
+    waarden daarvoor komen van de client zelf en kunnen vervalst zijn. Het client IP is daarom
+    het adres op plek TRUSTED_PROXY_COUNT van rechts. Zonder vertrouwde proxies, of als de header
+    minder adressen bevat, telt REMOTE_ADDR.
+    """
+    proxy_count = settings.TRUSTED_PROXY_COUNT
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxy_count > 0 and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(',')]
+        if len(addresses) >= proxy_count:
+            return addresses[-proxy_count]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+@never_cache
 def login_view(request):
     """Login pagina."""
     if request.user.is_authenticated:
         return redirect('vector_matching_app:index')
     
     if request.method == 'POST':
+        # Inlogpogingen per IP beperken voordat het wachtwoord gehasht wordt
+        rate_limit_key = f"login_attempts:{_client_ip(request)}"
+        cache.add(rate_limit_key, 0, LOGIN_RATE_LIMIT_WINDOW)
+        try:
+            attempts = cache.incr(rate_limit_key)
+        except ValueError:
+            attempts = 1
+        if attempts > LOGIN_RATE_LIMIT:
+            messages.error(request, 'Te veel inlogpogingen. Probeer het over een minuut opnieuw.')
+            return render(request, 'login.html', status=429)
+        
         username = request.POST.get('username', '').strip()
-        password = request.POST.get('password', '').strip()
+        # Wachtwoord niet strippen: spaties aan begin of eind horen bij het wachtwoord
+        password = request.POST.get('password', '')
         
         if username and password:
             user = authenticate(request, username=username, password=password)
             if user is not None:
+                cache.delete(rate_limit_key)
                 login(request, user)
                 messages.success(request, f'Welkom terug, {user.username}!')
                 next_url = request.GET.get('next', 'vector_matching_app:index')
@@ -1043,91 +969,31 @@ def logout_view(request):
 @login_required
 def api_vacatures_update_view(request):
     """API endpoint voor het updaten van vacatures vanuit XML feed."""
+    # Niet tegelijk met een update die al (op de achtergrond) loopt
+    if not cache.add(FEED_SYNC_LOCK_CACHE_KEY, True, FEED_SYNC_LOCK_TTL):
+        return JsonResponse({
+            'success': False,
+            'error': 'Er loopt al een vacature update.'
+        }, status=409)
+    
     try:
-        # Haal XML feed op
-        feed_url = "https://noordtalent.nl/werkzoeken-feed.xml"
-        response = requests.get(feed_url, timeout=30)
-        response.raise_for_status()
+        # Streamend parsen en bulk upserts, gedeeld met de update vanuit de interface
+        stats = sync_vacatures_from_feed()
         
-        # Parse XML
-        root = ET.fromstring(response.content)
-        
-        # Teller voor statistieken
-        toegevoegd = 0
-        bijgewerkt = 0
-        gedeactiveerd = 0
-        
-        # Verzamel alle externe IDs uit de feed
-        feed_externe_ids = set()
-        
-        # Verwerk elke vacature in de feed
-        for item in root.findall('.//vacature'):
-            try:
-                # Haal velden op
-                externe_id = item.find('id').text if item.find('id') is not None else None
-                title = item.find('title').text if item.find('title') is not None else ""
-                url = item.find('url').text if item.find('url') is not None else ""
-                company = item.find('company').text if item.find('company') is not None else ""
-                city = item.find('city').text if item.find('city') is not None else ""
-                zipcode = item.find('zipcode').text if item.find('zipcode') is not None else ""
-                description = item.find('description').text if item.find('description') is not None else ""
-                
-                if not externe_id:
-                    continue
-                    
-                feed_externe_ids.add(externe_id)
-                
-                # Probeer vacature te vinden of maak nieuwe aan
-                vacature, created = Vacature.objects.get_or_create(
-                    externe_id=externe_id,
-                    defaults={
-                        'titel': title,
-                        'organisatie': company,
-                        'plaats': city,
-                        'postcode': zipcode,
-                        'url': url,
-                        'beschrijving': description,
-                        'actief': True
-                    }
-                )
-                
-                if created:
-                    toegevoegd += 1
-                    logger.info(f"Vacature toegevoegd: {title} - {company}")
-                else:
-                    # Update bestaande vacature
-                    vacature.titel = title
-                    vacature.organisatie = company
-                    vacature.plaats = city
-                    vacature.postcode = zipcode
-                    vacature.url = url
-                    vacature.beschrijving = description
-                    vacature.actief = True
-                    vacature.save()
-                    bijgewerkt += 1
-                    logger.info(f"Vacature bijgewerkt: {title} - {company}")
-                    
-            except Exception as e:
-                logger.error(f"Fout bij verwerken vacature: {str(e)}")
-                continue
-        
-        # Markeer vacatures die niet meer in de feed staan als inactief
-        inactive_vacatures = Vacature.objects.filter(actief=True).exclude(externe_id__in=feed_externe_ids)
-        for vacature in inactive_vacatures:
-            vacature.actief = False
-            vacature.save()
-            gedeactiveerd += 1
-            logger.info(f"Vacature gedeactiveerd: {vacature.titel} - {vacature.organisatie}")
-        
-        # Retourneer JSON response
+        # Retourneer JSON response; bij een 304 van de feed is er niets verwerkt
+        if stats['niet_gewijzigd']:
+            message = 'Vacatures zijn al up-to-date, de feed is niet gewijzigd'
+        else:
+            message = 'Vacatures succesvol bijgewerkt'
         return JsonResponse({
             'success': True,
-            'message': 'Vacatures succesvol bijgewerkt',
+            'message': message,
+            'niet_gewijzigd': stats['niet_gewijzigd'],
             'statistieken': {
-                'toegevoegd': toegevoegd,
-                'bijgewerkt': bijgewerkt,
-                'gedeactiveerd': gedeactiveerd,
-                'totaal_actief': Vacature.objects.filter(actief=True).count()
+                'toegevoegd': stats['toegevoegd'],
+                'bijgewerkt': stats['bijgewerkt'],
+                'gedeactiveerd': stats['gedeactiveerd'],
+                'totaal_actief': stats['totaal_actief']
             }
         })
         
@@ -1138,7 +1004,7 @@ def api_vacatures_update_view(request):
             'error': f'Kon XML feed niet ophalen: {str(e)}'
         }, status=500)
         
-    except ET.ParseError as e:
+    except FEED_PARSE_ERRORS as e:
         logger.error(f"Fout bij parsen XML: {str(e)}")
         return JsonResponse({
             'success': False,
@@ -1151,31 +1017,25 @@ def api_vacatures_update_view(request):
             'success': False,
             'error': f'Onverwachte fout: {str(e)}'
         }, status=500)
+    
+    finally:
+        cache.delete(FEED_SYNC_LOCK_CACHE_KEY)
 
 
 @login_required
 def matching_view(request):
     """Toon matchresultaten tussen kandidaten en vacatures."""
-    from .models import Match
-    
-    # Haal echte matches op uit de database, gesorteerd op afstand status
-    # Eerst matches met afstand, dan zonder afstand
-    matches_with_distance = Match.objects.filter(
-        afstand_berekend=True
-    ).select_related('kandidaat', 'vacature').order_by('-score')
-    
-    matches_without_distance = Match.objects.filter(
-        afstand_berekend=False
-    ).select_related('kandidaat', 'vacature').order_by('-score')
-    
-    # Combineer en beperk tot 250
-    all_matches = list(matches_with_distance) + list(matches_without_distance)
-    matches = all_matches[:250]
+    # Haal de beste 250 matches op in één query: eerst matches met afstand, dan zonder afstand,
+    # met alleen de kolommen die de tabel toont
+    matches = Match.objects.select_related('kandidaat', 'vacature').only(
+        'id', 'score', 'afstand_km', 'afstand_berekend', 'timestamp',
+        'kandidaat__id', 'kandidaat__name',
+        'vacature__id', 'vacature__titel', 'vacature__organisatie',
+    ).order_by('-afstand_berekend', '-score')[:250]
     
     # Converteer naar format voor template
-    matches_data = []
-    for match in matches:
-        matches_data.append({
+    matches_data = [
+        {
             'match_id': match.id,
             'kandidaat_naam': match.kandidaat.name or f"Kandidaat {match.kandidaat.id}",
             'vacature_titel': match.vacature.titel,
@@ -1186,7 +1046,9 @@ def matching_view(request):
             'vacature_id': match.vacature.id,
             'afstand_berekend': match.afstand_berekend,
             'timestamp': match.timestamp
-        })
+        }
+        for match in matches
+    ]
     
     context = {
         'matches': matches_data,
@@ -1200,9 +1062,6 @@ def matching_view(request):
 @require_http_methods(["POST"])
 def generate_matches_view(request):
     """Genereer nieuwe matches via AJAX."""
-    from .tasks import generate_matches
-    from django.http import JsonResponse
-    
     try:
         logger.info("Start genereren matches via web interface")
         
@@ -1228,9 +1087,6 @@ def generate_matches_view(request):
 def calculate_distances_view(request):
     """Bereken afstanden voor alle matches die nog geen afstand hebben."""
     try:
-        from .models import Match, Candidate, Vacature
-        from .tasks import calculate_distance_for_match
-        
         # Debug: toon database status
         total_matches = Match.objects.count()
         matches_without_distance = Match.objects.filter(afstand_berekend=False)
@@ -1242,14 +1098,19 @@ def calculate_distances_view(request):
         logger.info(f"Database status - Matches: {total_matches} (zonder afstand: {matches_without_distance.count()}, met afstand: {matches_with_distance.count()})")
         logger.info(f"Candidaten: {total_candidates} (met locatie: {candidates_with_location}), Vacatures: {total_vacatures}")
         
-        # Haal alle matches op die nog geen afstand hebben
-        matches_to_process = matches_without_distance.select_related('kandidaat', 'vacature')
+        # Haal alle matches op die nog geen afstand hebben, met alleen de velden voor de afstandsberekening
+        matches_to_process = matches_without_distance.select_related('kandidaat', 'vacature').only(
+            'id', 'afstand_km', 'afstand_berekend',
+            'kandidaat__id', 'kandidaat__latitude', 'kandidaat__longitude',
+            'vacature__id', 'vacature__plaats', 'vacature__postcode',
+        )
         
         logger.info(f"Berekenen afstanden voor {matches_to_process.count()} matches")
         
         # Bereken afstanden voor alle matches zonder afstand
         calculated_count = 0
         error_count = 0
+        updated_matches = []
         
         for match in matches_to_process:
             try:
@@ -1262,7 +1123,7 @@ def calculate_distances_view(request):
                     if distance is not None:
                         match.afstand_km = distance
                         match.afstand_berekend = True
-                        match.save()
+                        updated_matches.append(match)
                         calculated_count += 1
                     else:
                         error_count += 1
@@ -1270,7 +1131,7 @@ def calculate_distances_view(request):
                     # Geen locatie beschikbaar - sla None op voor afstand
                     match.afstand_km = None
                     match.afstand_berekend = True  # Markeer als berekend om te voorkomen dat het opnieuw wordt geprobeerd
-                    match.save()
+                    updated_matches.append(match)
                     error_count += 1
                     
             except Exception as e:
@@ -1278,10 +1139,13 @@ def calculate_distances_view(request):
                 # Markeer als berekend met None om herhaling te voorkomen
                 match.afstand_km = None
                 match.afstand_berekend = True
-                match.save()
+                updated_matches.append(match)
                 error_count += 1
                 continue
         
+        # Sla alle berekende afstanden op in batches in plaats van een UPDATE per match
+        Match.objects.bulk_update(updated_matches, ['afstand_km', 'afstand_berekend'], batch_size=500)
+        
         return JsonResponse({
             'success': True,
             'message': f'Afstanden berekend: {calculated_count} succesvol, {error_count} fouten',
@@ -1297,15 +1161,27 @@ def calculate_distances_view(request):
         }, status=500)
 
 
+# Gedeelde sessie voor de PDOK autocomplete, zodat opeenvolgende zoekopdrachten de verbinding hergebruiken
+_pdok_session = requests.Session()
+
+# PDOK resultaten per zoekterm cachen; autocomplete stuurt veel dezelfde zoektermen
+LOCATION_SEARCH_CACHE_TTL = 3600
+
+
 @require_http_methods(["GET"])
 def location_search_view(request):
     """Zoek plaatsen op basis van query voor autocomplete."""
-    import requests
-    
     query = request.GET.get('q', '').strip()
     if len(query) < 2:
         return JsonResponse({'results': []})
     
+    # Zoekterm gehasht in de sleutel, zodat spaties en speciale tekens geen ongeldige cache sleutel geven
+    normalized_query = ' '.join(query.lower().split())
+    cache_key = f"location_search:{hashlib.sha256(normalized_query.encode('utf-8')).hexdigest()}"
+    results = cache.get(cache_key)
+    if results is not None:
+        return JsonResponse({'results': results})
+    
     try:
         # Zoek via PDOK
         pdok_url = "https://api.pdok.nl/bzk/locatieserver/search/v3_1/suggest"
@@ -1316,7 +1192,7 @@ def location_search_view(request):
             'fq': 'type:woonplaats'  # Alleen woonplaatsen
         }
         
-        response = requests.get(pdok_url, params=params, timeout=5)
+        response = _pdok_session.get(pdok_url, params=params, timeout=5)
         if response.status_code == 200:
             data = response.json()
             results = []
@@ -1341,6 +1217,8 @@ def location_search_view(request):
                         'longitude': float(lon)
                     })
             
+            # Alleen geslaagde antwoorden cachen, zodat een storing bij PDOK niet blijft hangen
+            cache.set(cache_key, results, LOCATION_SEARCH_CACHE_TTL)
             return JsonResponse({'results': results})
         
     except Exception as e:
@@ -1349,6 +1227,21 @@ def location_search_view(request):
     return JsonResponse({'results': []})
 
 
+# Bekende postcodes voor grote steden (eenvoudige mapping), één keer bij het laden van de module
+CITY_POSTCODES = {
+    'amsterdam': ['1011', '1012', '1013', '1014', '1015', '1016', '1017', '1018', '1019', '1020'],
+    'rotterdam': ['3011', '3012', '3013', '3014', '3015', '3016', '3017', '3018', '3019', '3020'],
+    'den haag': ['2511', '2512', '2513', '2514', '2515', '2516', '2517', '2518', '2519', '2520'],
+    'utrecht': ['3511', '3512', '3513', '3514', '3515', '3516', '3517', '3518', '3519', '3520'],
+    'eindhoven': ['5611', '5612', '5613', '5614', '5615', '5616', '5617', '5618', '5619', '5620'],
+    'tilburg': ['5011', '5012', '5013', '5014', '5015', '5016', '5017', '5018', '5019', '5020'],
+    'groningen': ['9711', '9712', '9713', '9714', '9715', '9716', '9717', '9718', '9719', '9720'],
+    'almere': ['1311', '1312', '1313', '1314', '1315', '1316', '1317', '1318', '1319', '1320'],
+    'breda': ['4811', '4812', '4813', '4814', '4815', '4816', '4817', '4818', '4819', '4820'],
+    'nijmegen': ['6511', '6512', '6513', '6514', '6515', '6516', '6517', '6518', '6519', '6520'],
+}
+
+
 @require_http_methods(["GET"])
 def postcode_suggest_view(request):
     """Suggereer postcode op basis van plaatsnaam."""
@@ -1356,64 +1249,67 @@ def postcode_suggest_view(request):
     if not place:
         return JsonResponse({'postcodes': []})
     
-    # Bekende postcodes voor grote steden (eenvoudige mapping)
-    city_postcodes = {
-        'amsterdam': ['1011', '1012', '1013', '1014', '1015', '1016', '1017', '1018', '1019', '1020'],
-        'rotterdam': ['3011', '3012', '3013', '3014', '3015', '3016', '3017', '3018', '3019', '3020'],
-        'den haag': ['2511', '2512', '2513', '2514', '2515', '2516', '2517', '2518', '2519', '2520'],
-        'utrecht': ['3511', '3512', '3513', '3514', '3515', '3516', '3517', '3518', '3519', '3520'],
-        'eindhoven': ['5611', '5612', '5613', '5614', '5615', '5616', '5617', '5618', '5619', '5620'],
-        'tilburg': ['5011', '5012', '5013', '5014', '5015', '5016', '5017', '5018', '5019', '5020'],
-        'groningen': ['9711', '9712', '9713', '9714', '9715', '9716', '9717', '9718', '9719', '9720'],
-        'almere': ['1311', '1312', '1313', '1314', '1315', '1316', '1317', '1318', '1319', '1320'],
-        'breda': ['4811', '4812', '4813', '4814', '4815', '4816', '4817', '4818', '4819', '4820'],
-        'nijmegen': ['6511', '6512', '6513', '6514', '6515', '6516', '6517', '6518', '6519', '6520'],
-    }
-    
     # Zoek exacte match
-    if place in city_postcodes:
-        return JsonResponse({'postcodes': city_postcodes[place]})
+    if place in CITY_POSTCODES:
+        return JsonResponse({'postcodes': CITY_POSTCODES[place]})
     
     # Zoek gedeeltelijke match
-    for city, postcodes in city_postcodes.items():
+    for city, postcodes in CITY_POSTCODES.items():
         if place in city or city in place:
             return JsonResponse({'postcodes': postcodes[:5]})  # Max 5 suggesties
     
     return JsonResponse({'postcodes': []})
 
 
-@login_required
-def debug_database_status_view(request):
-    """Debug view om database status te bekijken."""
-    from .models import Match, Candidate, Vacature
-    
-    total_matches = Match.objects.count()
-    matches_without_distance = Match.objects.filter(afstand_berekend=False).count()
-    matches_with_distance = Match.objects.filter(afstand_berekend=True).count()
-    total_candidates = Candidate.objects.count()
-    total_vacatures = Vacature.objects.count()
-    candidates_with_location = Candidate.objects.filter(latitude__isnull=False, longitude__isnull=False).count()
-    candidates_with_embedding = Candidate.objects.filter(embedding__isnull=False).count()
-    vacatures_with_embedding = Vacature.objects.filter(embedding__isnull=False).count()
+# Debug status kort cachen, zodat herladen van de pagina de tellingen niet steeds opnieuw uitvoert
+DEBUG_STATUS_CACHE_KEY = 'debug_database_status'
+DEBUG_STATUS_CACHE_TTL = 30
+
+
+def _debug_database_status():
+    """Tellingen en voorbeeldrijen voor de debug pagina, met één aggregate query per tabel."""
+    has_embedding = models.ExpressionWrapper(
+        models.Q(embedding__isnull=False), output_field=models.BooleanField()
+    )
     
-    # Sample data
-    sample_matches = list(Match.objects.select_related('kandidaat', 'vacature')[:5])
-    sample_candidates = list(Candidate.objects.all()[:5])
-    sample_vacatures = list(Vacature.objects.all()[:5])
+    match_counts = Match.objects.aggregate(
+        total_matches=models.Count('id'),
+        matches_without_distance=models.Count('id', filter=models.Q(afstand_berekend=False)),
+        matches_with_distance=models.Count('id', filter=models.Q(afstand_berekend=True)),
+    )
+    candidate_counts = Candidate.objects.aggregate(
+        total_candidates=models.Count('id'),
+        candidates_with_location=models.Count(
+            'id', filter=models.Q(latitude__isnull=False, longitude__isnull=False)
+        ),
+        candidates_with_embedding=models.Count('id', filter=models.Q(embedding__isnull=False)),
+    )
+    vacature_counts = Vacature.objects.aggregate(
+        total_vacatures=models.Count('id'),
+        vacatures_with_embedding=models.Count('id', filter=models.Q(embedding__isnull=False)),
+    )
     
-    context = {
-        'total_matches': total_matches,
-        'matches_without_distance': matches_without_distance,
-        'matches_with_distance': matches_with_distance,
-        'total_candidates': total_candidates,
-        'total_vacatures': total_vacatures,
-        'candidates_with_location': candidates_with_location,
-        'candidates_with_embedding': candidates_with_embedding,
-        'vacatures_with_embedding': vacatures_with_embedding,
-        'sample_matches': sample_matches,
-        'sample_candidates': sample_candidates,
-        'sample_vacatures': sample_vacatures,
+    # Sample data, met alleen de getoonde kolommen en zonder de embeddings zelf op te halen
+    return {
+        **match_counts,
+        **candidate_counts,
+        **vacature_counts,
+        'sample_matches': list(Match.objects.select_related('kandidaat', 'vacature').only(
+            'id', 'score', 'afstand_km', 'afstand_berekend', 'kandidaat__name', 'vacature__titel'
+        )[:5]),
+        'sample_candidates': list(Candidate.objects.only(
+            'id', 'name', 'city', 'latitude', 'longitude'
+        ).annotate(has_embedding=has_embedding)[:5]),
+        'sample_vacatures': list(Vacature.objects.only(
+            'id', 'titel', 'organisatie', 'plaats'
+        ).annotate(has_embedding=has_embedding)[:5]),
     }
+
+
+@login_required
+def debug_database_status_view(request):
+    """Debug view om database status te bekijken."""
+    context = cache.get_or_set(DEBUG_STATUS_CACHE_KEY, _debug_database_status, DEBUG_STATUS_CACHE_TTL)
     
     return render(request, 'debug_database_status.html', context)
 
@@ -1422,10 +1318,15 @@ def debug_database_status_view(request):
 @require_http_methods(["GET"])
 def get_match_afstand(request, match_id):
     """Haal afstand op voor een specifieke match."""
-    from .models import Match
-    
     try:
-        match = get_object_or_404(Match, id=match_id)
+        match = get_object_or_404(
+            Match.objects.select_related('kandidaat', 'vacature').only(
+                'id', 'afstand_km', 'afstand_berekend',
+                'kandidaat__id', 'kandidaat__latitude', 'kandidaat__longitude',
+                'vacature__id', 'vacature__plaats', 'vacature__postcode',
+            ),
+            id=match_id
+        )
         
         # Als afstand al berekend is, retourneer deze
         if match.afstand_berekend and match.afstand_km is not None:
@@ -1435,15 +1336,25 @@ def get_match_afstand(request, match_id):
                 'berekend': True
             })
         
-        # Bereken afstand (voor nu fictief, later met echte geolocatie)
-        # TODO: Implementeer echte afstandsberekening op basis van postcodes
-        import random
-        afstand = round(random.uniform(5, 100), 1)
+        # Zonder coördinaten van de kandidaat valt er niets te berekenen
+        if not match.kandidaat.latitude or not match.kandidaat.longitude:
+            return JsonResponse({
+                'success': False,
+                'error': 'Kandidaat heeft geen locatie'
+            })
+        
+        # Haversine afstand met een al gecachte vacature locatie, zonder externe API in het request;
+        # onbekende locaties vult calculate_distances_view aan
+        afstand = calculate_distance_for_match(match, geocode=False)
+        if afstand is None:
+            return JsonResponse({
+                'success': False,
+                'berekend': False,
+                'error': 'Afstand nog niet berekend'
+            })
         
-        # Update match met berekende afstand
-        match.afstand_km = afstand
-        match.afstand_berekend = True
-        match.save()
+        # Update match met berekende afstand, in één UPDATE
+        Match.objects.filter(id=match.id).update(afstand_km=afstand, afstand_berekend=True)
         
         return JsonResponse({
             'success': True,